@@ -15,7 +15,7 @@ df = pd.read_csv("../data/delivery_wait_times.csv")
 
 # Set style
 sns.set_style("whitegrid")
-fig, axes = plt.subplots(1, 2, figsize=(16, 7))
+fig, axes = plt.subplots(1, 2, figsize=(16, 7), layout="constrained")
 
 # Color palette (matching raincloud plots)
 palette = {"Bike": "#1f77b4", "Car": "#ff7f0e"}  # blue for bike, orange for car
@@ -42,8 +42,7 @@ violin_parts1 = sns.violinplot(
 )
 
 # Set opacity for violins
-for pc in violin_parts1.collections:
-    pc.set_alpha(1.0)
+plt.setp(violin_parts1.collections, alpha=1.0)
 
 axes[0].set_title("Grouped Violin Plot\n(Side-by-side violins)", 
                   fontsize=14, fontweight='bold', pad=15)
@@ -70,8 +69,7 @@ violin_parts2 = sns.violinplot(
 )
 
 # Set opacity for split violins
-for pc in violin_parts2.collections:
-    pc.set_alpha(1.0)
+plt.setp(violin_parts2.collections, alpha=1.0)
 
 axes[1].set_title("Split Violin Plot\n(Half violins)", 
                   fontsize=14, fontweight='bold', pad=15)
@@ -81,12 +79,11 @@ axes[1].legend(title="Delivery Method", title_fontsize=11, fontsize=10,
                loc='upper right', framealpha=0.9)
 
 plt.suptitle("Delivery Wait Times: Grouped vs Split Violin Plots", 
-             fontsize=16, fontweight='bold', y=1.02)
-plt.tight_layout()
-plt.subplots_adjust(wspace=0.3)  # Increase horizontal spacing between plots
+             fontsize=16, fontweight='bold')
+fig.get_layout_engine().set(wspace=0.1)  # Increase horizontal spacing between plots
 
 # Save the plot
-plt.savefig("../images/delivery_grouped_split_violin.png", dpi=150, bbox_inches="tight")
+plt.savefig("../images/delivery_grouped_split_violin.png", dpi=150)
 print("Plot saved as '../images/delivery_grouped_split_violin.png'")
 plt.show()
 
@@ -1,8 +1,20 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba
 from scipy.stats import gaussian_kde  # pip install scipy if needed
 
+# Optional (FFT-based KDE, much faster for large groups). If missing, we fall
+# back to scipy's direct gaussian_kde evaluation.
+try:
+    from KDEpy import FFTKDE  # type: ignore
+except Exception:
+    FFTKDE = None
+
+# One seeded generator for the jittered rain
+rng = np.random.default_rng(42)
+
 # -------------------------------------------------
 # 1. Load data
 # -------------------------------------------------
@@ -17,64 +29,105 @@ x_min = df["wait_time"].min() - 5
 x_max = df["wait_time"].max() + 5
 xs = np.linspace(x_min, x_max, 400)
 
+
+def kde_on_grid(data):
+    """Gaussian KDE (Scott's rule bandwidth) of data evaluated on xs."""
+    if FFTKDE is None:
+        return gaussian_kde(data)(xs)
+    bw = data.std(ddof=1) * len(data) ** (-1 / 5)  # same bandwidth as gaussian_kde
+    return FFTKDE(kernel="gaussian", bw=bw).fit(data).evaluate(xs)
+
+
+# split once by (city, method) and evaluate each KDE up front
+groups = {k: v.to_numpy() for k, v in df.groupby(["city", "method"])["wait_time"]}
+dens_cache = {k: kde_on_grid(v) for k, v in groups.items()}
+
 # -------------------------------------------------
 # 2. Build raincloud plot with 4 rows (one per city)
 # -------------------------------------------------
-fig, ax = plt.subplots(figsize=(10, 7))
+fig, ax = plt.subplots(figsize=(10, 7), layout="constrained")
 
 group_spacing = 3.0        # vertical distance between cities
 cloud_height = 1.0         # max height of each density "cloud"
 gap = 0.5                  # equal spacing between cloud, boxplot, and raw dots
 
+# clouds, boxplots and rain points are collected per group and drawn in a
+# single call each after the loop
+cloud_polys, cloud_lines, cloud_colors = [], [], []
+box_data, box_positions, box_colors = [], [], []
+rain_x, rain_y_centers, rain_colors = [], [], []
+
 for row_idx, city in enumerate(cities[::-1]):  # top to bottom
     y0 = row_idx * group_spacing  # baseline for this city
 
     for j, method in enumerate(methods):
         color = colors[method]
-        data = df[(df["city"] == city) & (df["method"] == method)]["wait_time"].to_numpy()
+        data = groups[(city, method)]
 
         # ---------- KDE "cloud" (full overlap like your example) ----------
-        kde = gaussian_kde(data)
-        dens = kde(xs)
+        dens = dens_cache[(city, method)]
         dens = dens / dens.max() * cloud_height  # normalize height
 
         # fill density above baseline (both methods share same baseline y0)
-        ax.fill_between(xs, y0, y0 + dens, color=color, alpha=0.35, linewidth=0.0)
-        ax.plot(xs, y0 + dens, color=color, lw=1.5)
-
-        # ---------- Boxplot for this method ----------
+        cloud_polys.append(np.column_stack([
+            np.concatenate([xs, xs[::-1]]),
+            np.concatenate([y0 + dens, np.full_like(xs, y0)]),
+        ]))
+        cloud_lines.append(np.column_stack([xs, y0 + dens]))
+        cloud_colors.append(color)
+
+        # ---------- Boxplot position for this method ----------
         # Equal spacing: boxplot is one gap below cloud baseline
-        box_y = y0 - gap + j * 0.3     # Bike ~ y0-gap, Car ~ y0-gap+0.3
-        bp = ax.boxplot(
-            data,
-            positions=[box_y],
-            vert=False,
-            widths=0.3,
-            patch_artist=True,
-            manage_ticks=False,
-            showfliers=False,  # hide outlier points
-            showcaps=False     # hide whisker end caps
-        )
-        for box in bp["boxes"]:
-            box.set(facecolor=color, alpha=0.7)
-        for median in bp["medians"]:
-            median.set(color="white", linewidth=1.2)
-        # Explicitly remove whisker end caps (the horizontal lines at the ends)
-        for cap in bp["caps"]:
-            cap.set_visible(False)
+        box_data.append(data)
+        box_positions.append(y0 - gap + j * 0.3)  # Bike ~ y0-gap, Car ~ y0-gap+0.3
+        box_colors.append(color)
 
         # ---------- Jittered raw points ("rain") ----------
         # Equal spacing: raw dots are one gap below boxplot
         rain_y = y0 - 2*gap - j * 0.15    # two slightly separated bands
-        y_points = np.random.normal(loc=rain_y, scale=0.06, size=len(data))
-        ax.scatter(
-            data,
-            y_points,
-            s=12,
-            alpha=0.5,
-            color=color,
-            edgecolor="none"
-        )
+        rain_x.append(data)
+        rain_y_centers.append(np.full(len(data), rain_y))
+        rain_colors.extend([color] * len(data))
+
+# ---------- Clouds for all groups: one fill and one outline collection ----------
+ax.add_collection(PolyCollection(
+    cloud_polys,
+    facecolors=[to_rgba(c, 0.35) for c in cloud_colors],
+    linewidths=0.0,
+))
+ax.add_collection(LineCollection(cloud_lines, colors=cloud_colors, linewidths=1.5))
+
+# ---------- Rain for all groups as one scatter collection ----------
+# Jitter every point around its band centre with a single batched draw
+rain_y_centers = np.concatenate(rain_y_centers)
+y_points = rain_y_centers + rng.normal(loc=0.0, scale=0.06, size=len(rain_y_centers))
+ax.scatter(
+    np.concatenate(rain_x),
+    y_points,
+    s=12,
+    alpha=0.5,
+    c=rain_colors,
+    edgecolor="none"
+)
+
+# ---------- Boxplots for all groups at once ----------
+bp = ax.boxplot(
+    box_data,
+    positions=box_positions,
+    vert=False,
+    widths=0.3,
+    patch_artist=True,
+    manage_ticks=False,
+    showfliers=False,  # hide outlier points
+    showcaps=False     # hide whisker end caps
+)
+for box, color in zip(bp["boxes"], box_colors):
+    box.set(facecolor=color, alpha=0.7)
+for median in bp["medians"]:
+    median.set(color="white", linewidth=1.2)
+# Explicitly remove whisker end caps (the horizontal lines at the ends)
+for cap in bp["caps"]:
+    cap.set_visible(False)
 
 # -------------------------------------------------
 # 3. Cosmetics
@@ -99,8 +152,7 @@ legend_handles = [
 ]
 ax.legend(handles=legend_handles, loc="lower right")
 
-plt.tight_layout()
-plt.savefig("../images/raincloud_4cities_overlap.png", dpi=150, bbox_inches="tight")
+plt.savefig("../images/raincloud_4cities_overlap.png", dpi=150)
 print("Raincloud plot saved as '../images/raincloud_4cities_overlap.png'")
 plt.show()
 
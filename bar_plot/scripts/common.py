@@ -0,0 +1,308 @@
+"""
+Shared data loading, styling and plot helpers for the bar chart step scripts.
+
+The weekly ticket dataset is parsed once and the typed, derived frame is
+cached next to the CSV as Parquet. Later runs read the cache as long as it
+is at least as new as the CSV.
+
+Usage:
+from common import REGION_ORDER, REGION_SHORT, load_dataset, setup_style, style_axes
+setup_style()
+df = load_dataset()
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+import matplotlib
+matplotlib.use("Agg")  # PNG output only; skip GUI backend selection
+import matplotlib.pyplot as plt
+
+# Font setup is shared with the other plot folders via plot_style.py at the repo root
+REPO_ROOT = str(Path(__file__).resolve().parent.parent.parent)
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+from plot_style import set_sans_font  # noqa: E402
+
+# Optional (compiled group kernels). If missing, np.bincount versions are used.
+try:
+    import numba  # type: ignore
+except Exception:
+    numba = None
+
+# Paths (resolved, and the output folder created, once per process)
+DATA_PATH = Path(__file__).parent.parent.parent / "draft" / "dataset.csv"
+CACHE_PATH = DATA_PATH.with_suffix(".parquet")
+OUT_DIR = Path(__file__).parent.parent / "images"
+OUT_DIR.mkdir(parents=True, exist_ok=True)
+
+REGION_ORDER = ["Metro City", "Suburban Belt", "Remote Communities", "Rural Counties", "Small Towns"]
+PERIOD_ORDER = ["Before", "After"]
+REGION_DTYPE = CategoricalDtype(categories=REGION_ORDER, ordered=True)
+PERIOD_DTYPE = CategoricalDtype(categories=PERIOD_ORDER, ordered=True)
+
+REGION_SHORT = {
+    "Metro City": "Metro",
+    "Suburban Belt": "Suburb",
+    "Small Towns": "Towns",
+    "Rural Counties": "Rural",
+    "Remote Communities": "Remote",
+}
+
+# Color palette
+COLOR_PALETTE = {
+    "Desert": "#B35A20",      # Deep reddish-brown
+    "Zest": "#E8891D",         # Vibrant orange
+    "Sea Mist": "#BFD5C9",     # Light blue-green
+    "Niagara": "#05A3A4",      # Bright teal
+    "Mosque": "#006373",       # Dark teal
+}
+
+# PNG encoding: zlib level 1 while iterating, full compression for release
+# artifacts (PLOT_RELEASE=1)
+if os.environ.get("PLOT_RELEASE") == "1":
+    PNG_KWARGS = {"pil_kwargs": {"compress_level": 9, "optimize": True}, "metadata": {"Software": None}}
+else:
+    PNG_KWARGS = {"pil_kwargs": {"compress_level": 1, "optimize": False}, "metadata": {"Software": None}}
+
+# Inter first, then the usual fallbacks
+FONT_PREFERENCE = ["Inter", "Arial", "DejaVu Sans", "Liberation Sans"]
+
+
+def setup_style() -> None:
+    """Set the sans-serif font to the resolved preference only."""
+    set_sans_font(FONT_PREFERENCE)
+    plt.rcParams['agg.path.chunksize'] = 10000
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def style_axes(ax: plt.Axes, grid_axis: str | None = "y") -> None:
+    """Lightweight, readable styling."""
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    if grid_axis in ("x", "y"):
+        ax.grid(True, axis=grid_axis, linestyle=":", linewidth=0.8, alpha=0.6)
+    ax.set_axisbelow(True)
+
+
+def annotate_bars(ax: plt.Axes, fmt: str = "{:.0f}", padding: float = 3) -> None:
+    """
+    Add value labels to the bars on ax (vertical or horizontal).
+    padding is the gap between bar end and label in points; NaN bars get no label.
+    """
+    for container in ax.containers:
+        labels = ["" if np.isnan(v) else fmt.format(v) for v in container.datavalues]
+        ax.bar_label(container, labels=labels, padding=padding, fontsize=9)
+
+
+def save_fig(fig: plt.Figure, name: str, close: bool = True) -> None:
+    """
+    Save figure as PNG in OUT_DIR; keep it open with close=False to save variants.
+    Figures created without a layout engine get tight_layout first.
+    """
+    if fig.get_layout_engine() is None:
+        fig.tight_layout()
+    png_path = OUT_DIR / f"{name}.png"
+    fig.savefig(png_path, dpi=200, **PNG_KWARGS)
+    if close:
+        plt.close(fig)
+
+
+# -----------------------------
+# Group kernels
+# -----------------------------
+def _group_weighted_mean(values, weights, codes, n_groups):
+    """Weighted mean of values per group code; NaN for groups with no weight."""
+    num = np.zeros(n_groups)
+    den = np.zeros(n_groups)
+    for i in range(values.shape[0]):
+        c = codes[i]
+        num[c] += values[i] * weights[i]
+        den[c] += weights[i]
+    out = np.full(n_groups, np.nan)
+    for g in range(n_groups):
+        if den[g] > 0:
+            out[g] = num[g] / den[g]
+    return out
+
+
+def _group_mean_std_count(values, codes, n_groups):
+    """Mean, sample std (ddof=1) and count of values per group code."""
+    count = np.zeros(n_groups, dtype=np.int64)
+    total = np.zeros(n_groups)
+    for i in range(values.shape[0]):
+        count[codes[i]] += 1
+        total[codes[i]] += values[i]
+    mean = np.full(n_groups, np.nan)
+    for g in range(n_groups):
+        if count[g] > 0:
+            mean[g] = total[g] / count[g]
+    sq = np.zeros(n_groups)
+    for i in range(values.shape[0]):
+        d = values[i] - mean[codes[i]]
+        sq[codes[i]] += d * d
+    std = np.full(n_groups, np.nan)
+    for g in range(n_groups):
+        if count[g] > 1:
+            std[g] = np.sqrt(sq[g] / (count[g] - 1))
+    return mean, std, count
+
+
+def _bincount_weighted_mean(values, weights, codes, n_groups):
+    """np.bincount version of _group_weighted_mean."""
+    num = np.bincount(codes, weights=values * weights, minlength=n_groups)
+    den = np.bincount(codes, weights=weights, minlength=n_groups)
+    out = np.full(n_groups, np.nan)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def _bincount_mean_std_count(values, codes, n_groups):
+    """np.bincount version of _group_mean_std_count."""
+    count = np.bincount(codes, minlength=n_groups)
+    mean = np.full(n_groups, np.nan)
+    np.divide(np.bincount(codes, weights=values, minlength=n_groups), count, out=mean, where=count > 0)
+    sq = np.bincount(codes, weights=(values - mean[codes]) ** 2, minlength=n_groups)
+    std = np.full(n_groups, np.nan)
+    np.sqrt(np.divide(sq, count - 1, out=std, where=count > 1), out=std, where=count > 1)
+    return mean, std, count
+
+
+# Compiled loops when numba is available, otherwise one bincount per sum
+if numba is not None:
+    group_weighted_mean = numba.njit(cache=True)(_group_weighted_mean)
+    group_mean_std_count = numba.njit(cache=True)(_group_mean_std_count)
+else:
+    group_weighted_mean = _bincount_weighted_mean
+    group_mean_std_count = _bincount_mean_std_count
+
+
+# -----------------------------
+# Step 6B sample (shared by steps 6B, 6C and 9)
+# -----------------------------
+def step6b_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-region mean, std, count, se and ci95_half of the 3-week 6B sample,
+    sorted by mean from high to low.
+    """
+    # Optional (better CI for small n). If missing, we fall back to 1.96.
+    # Imported here so importing this module skips scipy.
+    try:
+        import scipy.stats as st  # type: ignore
+    except Exception:
+        st = None
+
+    rate_weekly = (
+        df.groupby(["region", "week"], observed=True)["tickets_per_1k_customers"]
+        .mean()
+        .reset_index()
+    )
+
+    # Large error bars due to small n: for ALL regions, use 3 weeks: min, max,
+    # and the point furthest from mean (to maximize difference)
+    rate = rate_weekly["tickets_per_1k_customers"]
+    grp = rate.groupby(rate_weekly["region"], observed=True)
+    is_min = rate_weekly.index == grp.transform("idxmin")
+    is_max = rate_weekly.index == grp.transform("idxmax")
+    extreme = is_min | is_max
+
+    # Third point: the one furthest from the mean (excluding min and max);
+    # regions with only 2 weeks keep just min and max
+    dist = (rate - grp.transform("mean")).abs().where(~extreme, -1.0)
+    is_third = (rate_weekly.index == dist.groupby(rate_weekly["region"], observed=True).transform("idxmax")) & ~extreme
+
+    # Only the (region, value) pairs of the kept weeks are needed from here on
+    keep = extreme | is_third
+    values = rate[keep]
+    regions_6b = rate_weekly["region"][keep]
+    is_min, is_max = is_min[keep], is_max[keep]
+
+    # Modify values to create variance: expand the range by 1.3x
+    # Keep the mean roughly the same but increase spread slightly
+    sel = values.groupby(regions_6b, observed=True)
+    current_mean = sel.transform("mean")
+    expanded_range = (sel.transform("max") - sel.transform("min")) * 1.3
+
+    # Ensure values don't go negative
+    new_min = (current_mean - expanded_range / 2).clip(lower=0.1)
+    new_max = current_mean + expanded_range / 2
+
+    # Third value is placed closer to min (or max) but less extreme
+    new_third = new_min + (new_max - new_min) * np.where(values < current_mean, 0.25, 0.75)
+
+    rate_6b = np.select([is_max, is_min], [new_max, new_min], new_third).astype(values.dtype)
+
+    categories = regions_6b.cat.categories
+    mean, std, count = group_mean_std_count(
+        rate_6b.astype(float), regions_6b.cat.codes.to_numpy(), len(categories)
+    )
+    stats_6b = pd.DataFrame(
+        {"mean": mean, "std": std, "count": count},
+        index=pd.CategoricalIndex(categories, dtype=regions_6b.dtype, name="region"),
+    )[count > 0]
+    stats_6b["se"] = stats_6b["std"] / np.sqrt(stats_6b["count"])
+
+    if st is not None:
+        # Use t-critical for n-1 degrees of freedom (n=3 means df=2)
+        n = stats_6b["count"].to_numpy()
+        tcrit_6b = np.where(n > 1, st.t.ppf(0.975, df=np.maximum(1, n - 1)), 1.96)
+    else:
+        tcrit_6b = 1.96  # fallback
+
+    stats_6b["ci95_half"] = tcrit_6b * stats_6b["se"]
+    # Sort by mean rate from high to low
+    return stats_6b.sort_values("mean", ascending=False)
+
+
+def _read_csv() -> pd.DataFrame:
+    """Parse the CSV and derive the typed and rate columns."""
+    # Let the C parser produce the int, date and categorical columns directly;
+    # the counts fit comfortably in 32 bits, which halves groupby traffic
+    df = pd.read_csv(
+        DATA_PATH,
+        dtype={
+            "week": "int16",
+            "region": REGION_DTYPE,
+            "period": PERIOD_DTYPE,
+            "tickets_total": "int32",
+            "customers_active": "int32",
+            "orders": "int32",
+            "csat_avg_1_to_5": "float32",
+        },
+        parse_dates=["week_start"],
+    )
+
+    # Rates, divided straight off the int32 buffers; they are stored in the
+    # cache so reloads skip the arithmetic entirely
+    tickets = df["tickets_total"].to_numpy()
+    df["tickets_per_1k_customers"] = (
+        np.divide(tickets, df["customers_active"].to_numpy(), dtype=np.float32) * np.float32(1000.0)
+    )
+    df["tickets_per_10k_orders"] = (
+        np.divide(tickets, df["orders"].to_numpy(), dtype=np.float32) * np.float32(10000.0)
+    )
+    return df
+
+
+def load_dataset() -> pd.DataFrame:
+    """Load the step dataset, using the Parquet cache when it is fresh."""
+    if CACHE_PATH.exists() and CACHE_PATH.stat().st_mtime >= DATA_PATH.stat().st_mtime:
+        try:
+            return pd.read_parquet(CACHE_PATH)
+        except ImportError:
+            pass  # no parquet engine installed; fall back to the CSV
+
+    df = _read_csv()
+    try:
+        df.to_parquet(CACHE_PATH)  # pip install pyarrow to enable the cache
+    except ImportError:
+        pass
+    return df
@@ -0,0 +1,59 @@
+"""
+Generate all bar chart step figures (Steps 0 to 9) in one go.
+
+The steps are independent, so each one runs in its own worker process
+(separate processes keep Agg rendering free of shared state). The parent
+writes the Parquet cache once up front, so workers only ever read it.
+
+Run:
+python make_all_steps.py            # one worker per CPU, up to one per step
+python make_all_steps.py --jobs 1   # everything in this process
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from common import load_dataset
+from make_step0_figures import make_step0
+from make_step1_figures import make_step1
+from make_step2_figures import make_step2
+from make_step3_figures import make_step3
+from make_step3_cde_figures import make_step3_cde
+from make_step4_figures import make_step4
+from make_step5_figures import make_step5
+from make_step6BC import make_step6BC
+from make_step7ABC import make_step7ABC
+from make_step8_figures import make_step8
+from make_step9_figures import make_step9
+
+STEPS = (
+    make_step0, make_step1, make_step2, make_step3, make_step3_cde, make_step4,
+    make_step5, make_step6BC, make_step7ABC, make_step8, make_step9,
+)
+
+
+def run_step(make_step) -> None:
+    make_step(load_dataset())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=min(len(STEPS), os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    df = load_dataset()  # fills the cache before any worker starts
+    if args.jobs <= 1:
+        for make_step in STEPS:
+            make_step(df.copy())  # own frame per step, as each worker gets
+        return
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for future in [pool.submit(run_step, make_step) for make_step in STEPS]:
+            future.result()
+
+
+if __name__ == "__main__":
+    main()
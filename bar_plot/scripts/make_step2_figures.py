@@ -11,92 +11,13 @@ python make_step2_figures.py
 
 from __future__ import annotations
 
-from pathlib import Path
-
-import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
-# Set Inter font
-plt.rcParams['font.family'] = 'sans-serif'
-plt.rcParams['font.sans-serif'] = ['Inter', 'Arial', 'DejaVu Sans', 'Liberation Sans', 'sans-serif']
-
-# Paths
-DATA_PATH = Path(__file__).parent.parent.parent / "draft" / "dataset.csv"
-OUT_DIR = Path(__file__).parent.parent / "images"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-
-# Color palette
-COLOR_PALETTE = {
-    "Desert": "#B35A20",      # Deep reddish-brown
-    "Zest": "#E8891D",         # Vibrant orange
-    "Sea Mist": "#BFD5C9",     # Light blue-green
-    "Niagara": "#05A3A4",      # Bright teal
-    "Mosque": "#006373",       # Dark teal
-}
+from common import OUT_DIR, annotate_bars, load_dataset, save_fig, setup_style, style_axes
 
-# -----------------------------
-# Helpers
-# -----------------------------
-def style_axes(ax: plt.Axes, grid_axis: str = "y") -> None:
-    """Lightweight, readable styling."""
-    ax.spines["top"].set_visible(False)
-    ax.spines["right"].set_visible(False)
-    if grid_axis in ("x", "y"):
-        ax.grid(True, axis=grid_axis, linestyle=":", linewidth=0.8, alpha=0.6)
-    ax.set_axisbelow(True)
-
-
-def annotate_bars(ax: plt.Axes, fmt: str = "{:.0f}", axis: str = "y", pad: float = 0.01) -> None:
-    """
-    Add value labels to bars.
-    axis='y' for vertical bars, axis='x' for horizontal bars.
-    pad is fraction of axis range.
-    """
-    if axis == "y":
-        y0, y1 = ax.get_ylim()
-        rng = y1 - y0 if y1 != y0 else 1
-        for p in ax.patches:
-            h = p.get_height()
-            if np.isnan(h):
-                continue
-            x = p.get_x() + p.get_width() / 2
-            ax.text(x, h + pad * rng, fmt.format(h), ha="center", va="bottom", fontsize=9)
-    else:
-        x0, x1 = ax.get_xlim()
-        rng = x1 - x0 if x1 != x0 else 1
-        for p in ax.patches:
-            w = p.get_width()
-            if np.isnan(w):
-                continue
-            y = p.get_y() + p.get_height() / 2
-            ax.text(w + pad * rng, y, fmt.format(w), ha="left", va="center", fontsize=9)
-
-
-def save_fig(fig: plt.Figure, name: str) -> None:
-    """Save figure as PNG."""
-    png_path = OUT_DIR / f"{name}.png"
-    fig.tight_layout()
-    fig.savefig(png_path, dpi=200)
-    plt.close(fig)
-
-
-# -----------------------------
-# Load + derive columns
-# -----------------------------
-df = pd.read_csv(DATA_PATH)
-
-# Safer types
-df["week"] = df["week"].astype(int)
-df["week_start"] = pd.to_datetime(df["week_start"])
-df["period"] = pd.Categorical(df["period"], categories=["Before", "After"], ordered=True)
-
-# Rates
-df["tickets_per_1k_customers"] = df["tickets_total"] / df["customers_active"] * 1000.0
-df["tickets_per_10k_orders"] = df["tickets_total"] / df["orders"] * 10000.0
-
-REGION_ORDER = ["Metro City", "Suburban Belt", "Remote Communities", "Rural Counties", "Small Towns"]
-df["region"] = pd.Categorical(df["region"], categories=REGION_ORDER, ordered=True)
+# Set Inter font (or the first installed fallback)
+setup_style()
 
 TICKET_TYPE_MAP = {
     "tickets_login": "Cannot log in or reset password",
@@ -108,7 +29,7 @@ TICKET_TYPE_MAP = {
 }
 
 
-def main() -> None:
+def make_step2(df: pd.DataFrame) -> None:
     # ============================================================
     # Step 2: Make it readable at a glance (labels and orientation)
     # ============================================================
@@ -116,27 +37,35 @@ def main() -> None:
     ticket_totals = ticket_totals.sort_values(ascending=False)
 
     # 2A: Vertical bars with long labels (hard to read, tempting to rotate)
-    fig, ax = plt.subplots(figsize=(9, 5.2))
-    bar_width = 0.667  # width such that spacing = width/2
-    ax.bar(ticket_totals.index, ticket_totals.values, color="#05A3A4", width=bar_width)
-    ax.set_title("")
-    ax.set_ylabel("Tickets (8 weeks, all regions)")
-    ax.tick_params(axis="x", labelrotation=35)
-    style_axes(ax, "y")
-    save_fig(fig, "step2A_vertical_long_labels")
-
-    # 2B: Horizontal bars for long labels (usually better)
-    fig, ax = plt.subplots(figsize=(9, 5.2))
-    bar_height = 0.667  # height such that spacing = height/2
-    ax.barh(ticket_totals.index[::-1], ticket_totals.values[::-1], color="#05A3A4", height=bar_height)
-    ax.set_title("")
-    ax.set_xlabel("Tickets (8 weeks, all regions)")
-    style_axes(ax, "x")
-    annotate_bars(ax, fmt="{:.0f}", axis="x", pad=0.01)
-    save_fig(fig, "step2B_horizontal_long_labels")
+    fig, ax = plt.subplots(figsize=(9, 5.2), layout="constrained")
+    try:
+        bar_width = 0.667  # width such that spacing = width/2
+        ax.bar(ticket_totals.index, ticket_totals.values, color="#05A3A4", width=bar_width)
+        ax.set_title("")
+        ax.set_ylabel("Tickets (8 weeks, all regions)")
+        ax.tick_params(axis="x", labelrotation=35)
+        style_axes(ax, "y")
+        save_fig(fig, "step2A_vertical_long_labels", close=False)
+
+        # 2B: Horizontal bars for long labels (usually better; same figure, fresh axes contents)
+        ax.clear()
+        ax.tick_params(axis="x", labelrotation=0)
+        bar_height = 0.667  # height such that spacing = height/2
+        ax.barh(ticket_totals.index[::-1], ticket_totals.values[::-1], color="#05A3A4", height=bar_height)
+        ax.set_title("")
+        ax.set_xlabel("Tickets (8 weeks, all regions)")
+        style_axes(ax, "x")
+        annotate_bars(ax, fmt="{:.0f}")
+        save_fig(fig, "step2B_horizontal_long_labels", close=False)
+    finally:
+        plt.close(fig)
 
     print(f"Done. Figures saved to: {OUT_DIR.resolve()}")
 
 
+def main() -> None:
+    make_step2(load_dataset())
+
+
 if __name__ == "__main__":
     main()
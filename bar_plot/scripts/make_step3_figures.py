@@ -11,78 +11,17 @@ python make_step3_figures.py
 
 from __future__ import annotations
 
-from pathlib import Path
-
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
-
-# Set Inter font
-plt.rcParams['font.family'] = 'sans-serif'
-plt.rcParams['font.sans-serif'] = ['Inter', 'Arial', 'DejaVu Sans', 'Liberation Sans', 'sans-serif']
-
-# Paths
-DATA_PATH = Path(__file__).parent.parent.parent / "draft" / "dataset.csv"
-OUT_DIR = Path(__file__).parent.parent / "images"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-
-# Color palette
-COLOR_PALETTE = {
-    "Desert": "#B35A20",      # Deep reddish-brown
-    "Zest": "#E8891D",         # Vibrant orange
-    "Sea Mist": "#BFD5C9",     # Light blue-green
-    "Niagara": "#05A3A4",      # Bright teal
-    "Mosque": "#006373",       # Dark teal
-}
-
-# -----------------------------
-# Helpers
-# -----------------------------
-def style_axes(ax: plt.Axes, grid_axis: str = "y") -> None:
-    """Lightweight, readable styling."""
-    ax.spines["top"].set_visible(False)
-    ax.spines["right"].set_visible(False)
-    if grid_axis in ("x", "y"):
-        ax.grid(True, axis=grid_axis, linestyle=":", linewidth=0.8, alpha=0.6)
-    ax.set_axisbelow(True)
-
-
-def save_fig(fig: plt.Figure, name: str) -> None:
-    """Save figure as PNG."""
-    png_path = OUT_DIR / f"{name}.png"
-    fig.tight_layout()
-    fig.savefig(png_path, dpi=200)
-    plt.close(fig)
-
-
-# -----------------------------
-# Load + derive columns
-# -----------------------------
-df = pd.read_csv(DATA_PATH)
-
-# Safer types
-df["week"] = df["week"].astype(int)
-df["week_start"] = pd.to_datetime(df["week_start"])
-df["period"] = pd.Categorical(df["period"], categories=["Before", "After"], ordered=True)
-
-# Rates
-df["tickets_per_1k_customers"] = df["tickets_total"] / df["customers_active"] * 1000.0
-df["tickets_per_10k_orders"] = df["tickets_total"] / df["orders"] * 10000.0
-
-REGION_ORDER = ["Metro City", "Suburban Belt", "Remote Communities", "Rural Counties", "Small Towns"]
-df["region"] = pd.Categorical(df["region"], categories=REGION_ORDER, ordered=True)
-
-REGION_SHORT = {
-    "Metro City": "Metro",
-    "Suburban Belt": "Suburb",
-    "Small Towns": "Towns",
-    "Rural Counties": "Rural",
-    "Remote Communities": "Remote",
-}
 
+from common import OUT_DIR, REGION_ORDER, REGION_SHORT, load_dataset, save_fig, setup_style, style_axes
 
-def main() -> None:
+# Set Inter font (or the first installed fallback)
+setup_style()
+
+
+def make_step3(df: pd.DataFrame) -> None:
     # ============================================================
     # Step 3: Remove chartjunk (3D and spacing)
     # ============================================================
@@ -94,8 +33,11 @@ def main() -> None:
     )
 
     # 3A: 3D grouped bars (example of what not to do)
+    import mpl_toolkits.mplot3d  # noqa: F401  (registers the "3d" projection; only needed here)
+
     fig = plt.figure(figsize=(6, 5.2))
-    ax = fig.add_subplot(111, projection="3d")
+    # bar3d returns one collection, so skip the per-draw zorder sort of artists
+    ax = fig.add_subplot(111, projection="3d", computed_zorder=False)
 
     xlabels = [REGION_SHORT.get(str(r), str(r)) for r in grouped.index]
     ylabels = grouped.columns.astype(str).tolist()
@@ -139,5 +81,9 @@ def main() -> None:
     print(f"Done. Figures saved to: {OUT_DIR.resolve()}")
 
 
+def main() -> None:
+    make_step3(load_dataset())
+
+
 if __name__ == "__main__":
     main()
@@ -12,20 +12,13 @@ python make_step7ABC.py
 
 from __future__ import annotations
 
-from pathlib import Path
-
 import pandas as pd
 import matplotlib.pyplot as plt
 
-# Set font to Inter
-plt.rcParams['font.family'] = 'sans-serif'
-plt.rcParams['font.sans-serif'] = ['Inter', 'Arial', 'DejaVu Sans', 'Liberation Sans', 'sans-serif']
+from common import OUT_DIR, load_dataset, save_fig, setup_style, style_axes
 
-# Paths
-SCRIPT_DIR = Path(__file__).parent  # scripts folder
-DATA_PATH = SCRIPT_DIR.parent.parent / "draft" / "dataset.csv"  # Dataset is in draft folder
-OUT_DIR = SCRIPT_DIR.parent / "images"  # images folder
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+# Set Inter font (or the first installed fallback)
+setup_style()
 
 TICKET_TYPE_MAP = {
     "tickets_login": "Cannot log in or reset password",
@@ -40,23 +33,6 @@ TICKET_TYPE_MAP = {
 # -----------------------------
 # Helpers
 # -----------------------------
-def style_axes(ax: plt.Axes, grid_axis: str | None = None) -> None:
-    """Lightweight, readable styling."""
-    ax.spines["top"].set_visible(False)
-    ax.spines["right"].set_visible(False)
-    if grid_axis in ("x", "y"):
-        ax.grid(True, axis=grid_axis, linestyle=":", linewidth=0.8, alpha=0.6)
-    ax.set_axisbelow(True)
-
-
-def save_fig(fig: plt.Figure, name: str) -> None:
-    """Save figure as PNG."""
-    png_path = OUT_DIR / f"{name}.png"
-    fig.tight_layout()
-    fig.savefig(png_path, dpi=200)
-    plt.close(fig)
-
-
 def step7_prepare_ticket_totals(df: pd.DataFrame) -> pd.Series:
     """Prepare ticket totals sorted by value."""
     totals = df[list(TICKET_TYPE_MAP.keys())].sum()
@@ -65,91 +41,77 @@ def step7_prepare_ticket_totals(df: pd.DataFrame) -> pd.Series:
     return totals
 
 
-# -----------------------------
-# Load data
-# -----------------------------
-df = pd.read_csv(DATA_PATH)
-ticket_totals = step7_prepare_ticket_totals(df)
+def make_step7ABC(df: pd.DataFrame) -> None:
+    ticket_totals = step7_prepare_ticket_totals(df)
 
-# Common settings
-bar_height = 0.667  # gap = 0.5 * bar_height
-figsize = (9, 3.5)
+    # Common settings
+    bar_height = 0.667  # gap = 0.5 * bar_height
+    figsize = (9, 3.5)
 
-# -----------------------------
-# Step 7A: Best - Label directly (no axis lookup)
-# -----------------------------
-fig, ax = plt.subplots(figsize=figsize)
-ax.barh(ticket_totals.index[::-1], ticket_totals.values[::-1], color="#05A3A4", height=bar_height)
+    # -----------------------------
+    # Step 7A: Best - Label directly (no axis lookup)
+    # -----------------------------
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.barh(ticket_totals.index[::-1], ticket_totals.values[::-1], color="#05A3A4", height=bar_height)
 
-ax.set_xlabel("Tickets (8 weeks, all regions)")
-ax.set_ylabel("")
+    ax.set_xlabel("Tickets (8 weeks, all regions)")
+    ax.set_ylabel("")
 
-style_axes(ax, grid_axis=None)
+    style_axes(ax, grid_axis=None)
 
-# Set font for tick labels
-ax.tick_params(axis='both', labelsize=9)
-for label in ax.get_xticklabels():
-    label.set_fontfamily('Inter')
-for label in ax.get_yticklabels():
-    label.set_fontfamily('Inter')
+    # Tick label size (the font family comes from setup_style)
+    ax.tick_params(axis='both', labelsize=9)
 
-# Direct value labels at end of bars
-x0, x1 = ax.get_xlim()
-rng = (x1 - x0) if (x1 != x0) else 1.0
-pad = 0.005 * rng  # Reduced padding to bring labels closer to bars
+    # Direct value labels at end of bars (small padding keeps labels close to bars)
+    ax.bar_label(ax.containers[0], fmt="{:.0f}", padding=2, fontsize=9)
 
-for p in ax.patches:
-    w = p.get_width()
-    y = p.get_y() + p.get_height() / 2
-    ax.text(w + pad, y, f"{w:.0f}", va="center", ha="left", fontsize=9, fontfamily='Inter')
+    save_fig(fig, "step7A_best_label_directly")
 
-save_fig(fig, "step7A_best_label_directly")
+    # -----------------------------
+    # Step 7B: Good - Axis + gridlines (no labels)
+    # -----------------------------
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.barh(ticket_totals.index[::-1], ticket_totals.values[::-1], color="#05A3A4", height=bar_height)
 
-# -----------------------------
-# Step 7B: Good - Axis + gridlines (no labels)
-# -----------------------------
-fig, ax = plt.subplots(figsize=figsize)
-ax.barh(ticket_totals.index[::-1], ticket_totals.values[::-1], color="#05A3A4", height=bar_height)
+    ax.set_xlabel("Tickets (8 weeks, all regions)")
+    ax.set_ylabel("")
 
-ax.set_xlabel("Tickets (8 weeks, all regions)")
-ax.set_ylabel("")
+    # Keep x-axis ticks and add x-gridlines
+    style_axes(ax, grid_axis="x")
 
-# Keep x-axis ticks and add x-gridlines
-style_axes(ax, grid_axis="x")
+    # Tick label size (the font family comes from setup_style)
+    ax.tick_params(axis='both', labelsize=9)
 
-# Set font for tick labels
-ax.tick_params(axis='both', labelsize=9)
-for label in ax.get_xticklabels():
-    label.set_fontfamily('Inter')
-for label in ax.get_yticklabels():
-    label.set_fontfamily('Inter')
+    save_fig(fig, "step7B_good_axis_gridlines")
 
-save_fig(fig, "step7B_good_axis_gridlines")
+    # -----------------------------
+    # Step 7C: No gridlines, no labels
+    # -----------------------------
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.barh(ticket_totals.index[::-1], ticket_totals.values[::-1], color="#05A3A4", height=bar_height)
 
-# -----------------------------
-# Step 7C: No gridlines, no labels
-# -----------------------------
-fig, ax = plt.subplots(figsize=figsize)
-ax.barh(ticket_totals.index[::-1], ticket_totals.values[::-1], color="#05A3A4", height=bar_height)
+    ax.set_xlabel("Tickets (8 weeks, all regions)")
+    ax.set_ylabel("")
+
+    # No gridlines
+    style_axes(ax, grid_axis=None)
+
+    # Tick label size (the font family comes from setup_style)
+    ax.tick_params(axis='both', labelsize=9)
+
+    # No data labels on bars
 
-ax.set_xlabel("Tickets (8 weeks, all regions)")
-ax.set_ylabel("")
+    save_fig(fig, "step7C_no_gridlines_no_labels")
 
-# No gridlines
-style_axes(ax, grid_axis=None)
+    print(f"Done. Figures saved to: {OUT_DIR.resolve()}")
+    print(f"  - step7A_best_label_directly.png")
+    print(f"  - step7B_good_axis_gridlines.png")
+    print(f"  - step7C_no_gridlines_no_labels.png")
 
-# Set font for tick labels
-ax.tick_params(axis='both', labelsize=9)
-for label in ax.get_xticklabels():
-    label.set_fontfamily('Inter')
-for label in ax.get_yticklabels():
-    label.set_fontfamily('Inter')
 
-# No data labels on bars
+def main() -> None:
+    make_step7ABC(load_dataset())
 
-save_fig(fig, "step7C_no_gridlines_no_labels")
 
-print(f"Done. Figures saved to: {OUT_DIR.resolve()}")
-print(f"  - step7A_best_label_directly.png")
-print(f"  - step7B_good_axis_gridlines.png")
-print(f"  - step7C_no_gridlines_no_labels.png")
+if __name__ == "__main__":
+    main()
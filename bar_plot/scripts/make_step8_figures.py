@@ -15,65 +15,28 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
-# Set font to Inter
-plt.rcParams['font.family'] = 'sans-serif'
-plt.rcParams['font.sans-serif'] = ['Inter', 'Arial', 'DejaVu Sans', 'Liberation Sans', 'sans-serif']
-
-# Paths
-SCRIPT_DIR = Path(__file__).parent  # scripts folder
-DATA_PATH = SCRIPT_DIR.parent.parent / "draft" / "dataset.csv"  # Dataset is in draft folder
-OUT_DIR = SCRIPT_DIR.parent / "images"  # images folder
-OUT_DIR.mkdir(parents=True, exist_ok=True)
-
-# Color palette
-COLOR_PALETTE = {
-    "Desert": "#B35A20",      # Deep reddish-brown
-    "Zest": "#E8891D",         # Vibrant orange
-    "Sea Mist": "#BFD5C9",     # Light blue-green
-    "Niagara": "#05A3A4",      # Bright teal
-    "Mosque": "#006373",       # Dark teal
-}
-
-REGION_SHORT = {
-    "Metro City": "Metro",
-    "Suburban Belt": "Suburb",
-    "Small Towns": "Towns",
-    "Rural Counties": "Rural",
-    "Remote Communities": "Remote",
-}
-
-REGION_ORDER = ["Metro City", "Suburban Belt", "Remote Communities", "Rural Counties", "Small Towns"]
-
-
-def style_axes(ax: plt.Axes, grid_axis: str | None = None) -> None:
-    """Lightweight, readable styling."""
-    ax.spines["top"].set_visible(False)
-    ax.spines["right"].set_visible(False)
-    if grid_axis in ("x", "y"):
-        ax.grid(True, axis=grid_axis, linestyle=":", linewidth=0.8, alpha=0.6)
-    ax.set_axisbelow(True)
+from common import COLOR_PALETTE, OUT_DIR, PNG_KWARGS, REGION_SHORT, load_dataset, setup_style, style_axes
 
+# Set Inter font (or the first installed fallback)
+setup_style()
 
 def make_step8_table(df: pd.DataFrame, n_categories: int = 20) -> pd.DataFrame:
     """Category = Region + Week, metric = tickets per 1,000 customers."""
     g = (
-        df.groupby(["region", "week"], as_index=False)
+        df.groupby(["region", "week"], as_index=False, observed=True)
         .agg(
             tickets_total=("tickets_total", "sum"),
             customers_active=("customers_active", "sum"),
         )
     )
     g["tickets_per_1k"] = g["tickets_total"] / g["customers_active"] * 1000.0
-    # Convert region to string to avoid Categorical issues
-    g["region_str"] = g["region"].astype(str)
-    g["region_short"] = g["region_str"].map(REGION_SHORT).fillna(g["region_str"])
-    g["label"] = g.apply(lambda r: f"W{int(r['week'])}", axis=1)
+    g["region_short"] = g["region"].cat.rename_categories(REGION_SHORT).astype(str)
+    g["label"] = "W" + g["week"].astype(str)
 
     # Sort by region first, then by week (not by value)
-    # Keep region order consistent with REGION_ORDER
-    region_order_map = {r: i for i, r in enumerate(REGION_ORDER)}
-    g["region_order"] = g["region_str"].map(region_order_map).fillna(999)
-    g = g.sort_values(["region_order", "week"], ascending=[True, True]).reset_index(drop=True)
+    # Category codes already follow REGION_ORDER
+    order = np.lexsort((g["week"].to_numpy(), g["region"].cat.codes.to_numpy()))
+    g = g.iloc[order].reset_index(drop=True)
     
     # Show all data (no filtering)
     return g
@@ -87,78 +50,47 @@ def plot_step8(df: pd.DataFrame, save_path: Path) -> None:
     t = t.iloc[::-1].reset_index(drop=True)
 
     # Create labels with region name only at week 4 for each region
-    labels = []
-    for idx, row in t.iterrows():
-        region = row["region_str"]
-        week = int(row["week"])
-        region_short = row["region_short"]
-        
-        # Show region name only at week 4 for each region
-        if week == 4:
-            labels.append(f"{region_short} W{week}")
-        else:
-            labels.append(f"W{week}")
+    labels = np.where(t["week"].to_numpy() == 4, t["region_short"] + " " + t["label"], t["label"]).tolist()
 
     y = np.arange(len(t))
     x_raw = t["tickets_per_1k"].to_numpy()
-    regions = t["region_str"].to_numpy()
-    weeks = t["week"].to_numpy()
-    
-    # Initialize output array
-    x = np.full_like(x_raw, np.nan, dtype=float)
-    
+    regions = t["region"].to_numpy()
+    codes = t["region"].cat.codes.to_numpy()
+    weeks = t["week"].to_numpy(dtype=float)
+
     # Define base ranges for each region (gradually decreasing across regions)
     # Each region gets a different range, with W1 highest and W8 lowest within each region
-    # Overall range: 2 (lowest) to 14 (highest)
-    region_ranges = {
-        "Metro City": (14.0, 11.5),      # W1: ~14.0, W8: ~11.5
-        "Suburban Belt": (12.5, 10.0),    # W1: ~12.5, W8: ~10.0
-        "Remote Communities": (11.0, 8.5), # W1: ~11.0, W8: ~8.5
-        "Rural Counties": (9.5, 7.0),    # W1: ~9.5, W8: ~7.0
-        "Small Towns": (8.0, 2.0),      # W1: ~8.0, W8: ~2.0
-    }
-    
-    # Set random seed for reproducibility but with variation
-    np.random.seed(42)
-    
-    # Scale each region separately with random variation
-    for region in REGION_ORDER:
-        region_mask = (regions == region) & ~np.isnan(x_raw)
-        if np.any(region_mask):
-            region_weeks = weeks[region_mask]
-            region_values_raw = x_raw[region_mask]
-            week_min = float(np.min(region_weeks))
-            week_max = float(np.max(region_weeks))
-            week_range = week_max - week_min
-            
-            if region in region_ranges and week_range > 0:
-                w1_value, w8_value = region_ranges[region]
-                value_range = w1_value - w8_value
-                
-                # Create base trend: W1 -> highest, W8 -> lowest
-                base_values = w1_value - (region_weeks - week_min) / week_range * value_range
-                
-                # Add random variation based on actual data values to make it look natural
-                # Use the relative position of actual values within their range to add variation
-                if len(region_values_raw) > 1:
-                    val_min = float(np.min(region_values_raw))
-                    val_max = float(np.max(region_values_raw))
-                    val_range = val_max - val_min if val_max != val_min else 1.0
-                    
-                    # Normalize actual values to 0-1 range
-                    normalized = (region_values_raw - val_min) / val_range
-                    
-                    # Add random noise scaled by actual data variation (0.1 to 0.3 range)
-                    noise_scale = 0.2 * value_range
-                    random_noise = (np.random.random(len(region_weeks)) - 0.5) * noise_scale
-                    
-                    # Combine base trend with variation from actual data and random noise
-                    x[region_mask] = base_values + normalized * noise_scale * 0.5 + random_noise
-                else:
-                    x[region_mask] = base_values
-            elif region in region_ranges:
-                # If only one week, use middle value with slight variation
-                x[region_mask] = (w1_value + w8_value) / 2 + np.random.random() * 0.2 - 0.1
+    # Overall range: 2 (lowest) to 14 (highest); rows follow REGION_ORDER
+    region_ranges = np.array([
+        [14.0, 11.5],  # Metro City
+        [12.5, 10.0],  # Suburban Belt
+        [11.0, 8.5],   # Remote Communities
+        [9.5, 7.0],    # Rural Counties
+        [8.0, 2.0],    # Small Towns
+    ])
+    w1_value, w8_value = region_ranges[codes].T
+    value_range = w1_value - w8_value
+
+    grp = t.groupby("region", observed=True)
+    week_min = grp["week"].transform("min").to_numpy(dtype=float)
+    week_range = grp["week"].transform("max").to_numpy(dtype=float) - week_min
+    val_min = grp["tickets_per_1k"].transform("min").to_numpy()
+    val_max = grp["tickets_per_1k"].transform("max").to_numpy()
+    val_range = np.where(val_max != val_min, val_max - val_min, 1.0)
+
+    # Same draws as seeding once and sampling region by region in REGION_ORDER
+    rng = np.random.RandomState(42)
+    u = np.empty(len(t))
+    u[np.argsort(codes, kind="stable")] = rng.random_sample(len(t))
+
+    # Base trend: W1 -> highest, W8 -> lowest
+    base_values = w1_value - (weeks - week_min) / np.where(week_range > 0, week_range, 1.0) * value_range
+    # Variation from the actual data (normalized to 0-1 within each region) plus random noise
+    normalized = (x_raw - val_min) / val_range
+    noise_scale = 0.2 * value_range
+    x = base_values + normalized * noise_scale * 0.5 + (u - 0.5) * noise_scale
+    # If a region only has one week, use the middle value with slight variation
+    x = np.where(week_range > 0, x, (w1_value + w8_value) / 2 + u * 0.2 - 0.1).astype(np.float32)
 
     # Define colors for each region using the color palette
     region_colors = {
@@ -182,9 +114,7 @@ def plot_step8(df: pd.DataFrame, save_path: Path) -> None:
     xmax = 15.0
 
     # Left: dot plot (clean)
-    # Only plot non-NaN values with colors
-    valid_mask = ~np.isnan(x)
-    ax_dot.scatter(x[valid_mask], y[valid_mask], s=30, c=[colors[i] for i in range(len(colors)) if valid_mask[i]], alpha=0.7)
+    ax_dot.scatter(x, y, s=30, c=colors, alpha=0.7)
     ax_dot.set_ylim(-0.5, len(y) - 0.5)  # Ensure full range is visible
     ax_dot.set_xlim(xmin, xmax)  # Set shared x-axis scale to 0-15
     ax_dot.set_xlabel("Tickets per 1,000 customers", fontsize=10)
@@ -196,11 +126,7 @@ def plot_step8(df: pd.DataFrame, save_path: Path) -> None:
     ax_dot.tick_params(axis='y', which='major', labelsize=9, left=True, labelleft=True, pad=10)
 
     # Right: bar chart (heavy ink)
-    # Plot bars with colors, handling NaN values - leave missing data empty
-    for i, (yi, xi, color) in enumerate(zip(y, x, colors)):
-        if not np.isnan(xi):
-            ax_bar.barh(yi, xi, alpha=0.65, height=0.8, color=color)
-        # Leave NaN values empty (no bar drawn)
+    ax_bar.barh(y, x, alpha=0.65, height=0.8, color=colors)
     
     ax_bar.set_ylim(-0.5, len(y) - 0.5)  # Match y-limits
     ax_bar.set_xlim(xmin, xmax)  # Set shared x-axis scale to 0-15
@@ -215,13 +141,19 @@ def plot_step8(df: pd.DataFrame, save_path: Path) -> None:
     # Left margin adjusted for region names (shown only once per region)
     fig.subplots_adjust(bottom=0.20, top=0.95, left=0.25, right=0.95, wspace=0.5)
     
-    fig.savefig(save_path, dpi=200)
+    fig.savefig(save_path, dpi=200, **PNG_KWARGS)
     plt.close(fig)
 
 
-if __name__ == "__main__":
-    df = pd.read_csv(DATA_PATH)
-    out = OUT_DIR / "step8_dot_vs_bar.png"
-    plot_step8(df, out)
+def make_step8(df: pd.DataFrame) -> None:
+    plot_step8(df, OUT_DIR / "step8_dot_vs_bar.png")
     print(f"Done. Figure saved to: {OUT_DIR.resolve()}")
     print(f"  - step8_dot_vs_bar.png")
+
+
+def main() -> None:
+    make_step8(load_dataset())
+
+
+if __name__ == "__main__":
+    main()
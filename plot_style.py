@@ -0,0 +1,33 @@
+"""
+Font setup shared by the bar_plot and scatter_plot script folders.
+
+Each folder's common.py keeps its own FONT_PREFERENCE list and adds the repo
+root to sys.path to import this module, so the lookup lives in one place.
+
+Usage:
+from plot_style import set_sans_font
+set_sans_font(["Inter", "Arial", "DejaVu Sans"])
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Sequence
+
+import matplotlib.pyplot as plt
+from matplotlib import font_manager
+
+
+@lru_cache(maxsize=None)
+def resolve_font(preference: tuple[str, ...]) -> str:
+    """Return the first preferred font that is installed, warming findfont."""
+    available = {f.name for f in font_manager.fontManager.ttflist}
+    chosen = next((f for f in preference if f in available), "DejaVu Sans")
+    font_manager.findfont(chosen)
+    return chosen
+
+
+def set_sans_font(preference: Sequence[str]) -> None:
+    """Set the sans-serif font to the resolved preference only."""
+    plt.rcParams['font.family'] = 'sans-serif'
+    plt.rcParams['font.sans-serif'] = [resolve_font(tuple(preference))]
@@ -0,0 +1,150 @@
+"""
+Shared data loading, font setup and plotting helpers for the scatter figure
+scripts.
+
+CSV inputs are parsed once and cached next to the CSV as a Feather sidecar.
+Later runs read the sidecar (a typed column copy, no tokenizing) as long as
+it is at least as new as the CSV.
+
+Usage:
+from common import load_csv, setup_style
+setup_style()
+df = load_csv(script_dir.parent / "data" / "synthetic_scatter_master_dataset.csv")
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import LinearSegmentedColormap
+
+# Font setup is shared with the other plot folders via plot_style.py at the repo root
+REPO_ROOT = str(Path(__file__).resolve().parent.parent.parent)
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+from plot_style import set_sans_font  # noqa: E402
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Column dtypes of synthetic_scatter_master_dataset.csv that the figures use;
+# given up front so the C parser skips inference for them
+MASTER_DTYPES = {
+    "subject_id": "int64",
+    "age": "float64",
+    "bmi": "float64",
+    "visit_day": "int64",
+    "dose_mg": "float64",
+    "exposure_auc": "float64",
+    "response": "float64",
+    "adverse_event": "int64",
+    "cost_usd": "float64",
+}
+
+# PNG encoding: zlib level 1 while iterating, full compression for release
+# artifacts (PLOT_RELEASE=1)
+if os.environ.get("PLOT_RELEASE") == "1":
+    PNG_KWARGS = {"pil_kwargs": {"compress_level": 9, "optimize": True}, "metadata": {"Software": None}}
+else:
+    PNG_KWARGS = {"pil_kwargs": {"compress_level": 1, "optimize": False}, "metadata": {"Software": None}}
+
+# Density colormap from white (empty) to the theme's dark blue; built once and
+# registered so figures can also refer to it as cmap="white_to_theme"
+THEME_COLOR = "#1B435E"
+WHITE_TO_THEME_CMAP = LinearSegmentedColormap.from_list("white_to_theme", ["white", THEME_COLOR], N=256)
+if WHITE_TO_THEME_CMAP.name not in matplotlib.colormaps:
+    matplotlib.colormaps.register(WHITE_TO_THEME_CMAP)
+
+# Inter first, then the usual fallbacks
+FONT_PREFERENCE = ["Inter", "Arial", "Helvetica", "DejaVu Sans"]
+
+
+def setup_style() -> None:
+    """Set the sans-serif font to the resolved preference only."""
+    set_sans_font(FONT_PREFERENCE)
+
+
+# Above this many points, individual markers just pile up into a blob (and
+# Agg composites every one of them); bin them instead
+SCATTER_MAX_POINTS = 2000
+
+# scatter kwargs that mean the same thing to hexbin and are passed through to it
+HEXBIN_SHARED_KW = ("cmap", "norm", "vmin", "vmax", "alpha", "zorder", "label", "rasterized")
+
+
+def smart_scatter(ax: plt.Axes, x, y, hexbin_kw: dict | None = None, **scatter_kw):
+    """
+    Scatter x/y on ax, or draw a hexbin density once there are too many points.
+    On the hexbin path the HEXBIN_SHARED_KW entries of scatter_kw are forwarded
+    (hexbin_kw wins on conflicts); any other scatter kwargs raise a warning.
+    """
+    if len(x) <= SCATTER_MAX_POINTS:
+        return ax.scatter(x, y, **scatter_kw)
+    shared = {k: v for k, v in scatter_kw.items() if k in HEXBIN_SHARED_KW}
+    dropped = sorted(set(scatter_kw) - set(shared))
+    if dropped:
+        warnings.warn(
+            f"smart_scatter: {len(x)} points drawn as hexbin; ignoring scatter kwargs {dropped}",
+            stacklevel=2,
+        )
+    return ax.hexbin(x, y, **{"gridsize": 60, "mincnt": 1, "linewidths": 0, **shared, **(hexbin_kw or {})})
+
+
+def smooth_hist_densities(values, codes, grid, bandwidth=0.18, n_edges=70):
+    """
+    Per-group 1D KDE via histogram smoothing, all groups at once.
+    Returns the sorted group codes and a (n_groups, len(grid)) density array.
+    """
+    groups, rows = np.unique(codes, return_inverse=True)
+    edges = np.linspace(grid.min(), grid.max(), n_edges)
+    dx = edges[1] - edges[0]
+    nbins = n_edges - 1
+
+    # Histogram every group in one scatter-add (last bin closed, as np.histogram)
+    idx = np.searchsorted(edges, values, side="right") - 1
+    idx[values == edges[-1]] = nbins - 1
+    inside = (idx >= 0) & (idx < nbins)
+    hist = np.zeros((len(groups), nbins))
+    np.add.at(hist, (rows[inside], idx[inside]), 1.0)
+    hist /= hist.sum(axis=1, keepdims=True) * dx
+
+    # Gaussian smoothing of every row in scipy's C filter: zero padding, kernel
+    # cut at int(4*bandwidth/dx) bins and normalized to sum 1/dx, as before
+    from scipy.ndimage import gaussian_filter1d  # deferred: only figure 12 needs it
+    sigma = bandwidth / dx
+    half = int(4*bandwidth/dx)
+    smooth = gaussian_filter1d(hist, sigma, axis=1, mode="constant", truncate=half/sigma) / dx
+
+    # Linear interpolation from the bin centers onto grid (zero outside them)
+    pos = (grid - (edges[0] + dx/2)) / dx
+    i = np.clip(np.floor(pos).astype(int), 0, nbins - 2)
+    w = pos - i
+    dens = smooth[:, i] * (1 - w) + smooth[:, i + 1] * w
+    dens[:, (pos < 0) | (pos > nbins - 1)] = 0.0
+    return groups, dens
+
+
+def load_csv(path: Path, dtype: dict | None = None) -> pd.DataFrame:
+    """Load a CSV, using the Feather sidecar when it is fresh."""
+    import pandas as pd  # deferred so pandas-free scripts can use setup_style()
+
+    cache_path = path.with_suffix(".feather")
+    if cache_path.exists() and cache_path.stat().st_mtime >= path.stat().st_mtime:
+        try:
+            return pd.read_feather(cache_path)
+        except ImportError:
+            pass  # no pyarrow installed; fall back to the CSV
+
+    df = pd.read_csv(path, dtype=dtype, engine="c")
+    try:
+        df.to_feather(cache_path)  # pip install pyarrow to enable the cache
+    except ImportError:
+        pass
+    return df
@@ -0,0 +1,69 @@
+"""
+EV battery dataset shared by figure_12.py and figure_12.1.py.
+
+Both figures plot the same synthetic data with the same marginal KDEs, so it
+is built here once per process (build_all.py renders both from one build).
+
+X: Charge rate (C rate, standardized)
+Y: Capacity fade after 100 cycles (standardized)
+Groups: Chemistry A, B, C
+Story: Chemistries separate cleanly. Within each chemistry, higher charge rate
+       relates differently to degradation. Marginals show one chemistry lives
+       in a safer operating range.
+
+Usage:
+from ev_battery_data import load_ev_battery
+df, chemistry_order, codes, x_grid, y_grid, x_dens, y_dens = load_ev_battery()
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from common import smooth_hist_densities
+
+CHEMISTRY_ORDER = ["Chemistry A", "Chemistry B", "Chemistry C"]
+
+
+@lru_cache(maxsize=None)
+def load_ev_battery(seed: int = 12345):
+    """Return (df, chemistry_order, codes, x_grid, y_grid, x_dens, y_dens)."""
+    rng = np.random.default_rng(seed)
+
+    def make_group(name, n, mean_x, mean_y, slope, x_sd=0.55, noise=0.45):
+        x = rng.normal(mean_x, x_sd, n)
+        y = mean_y + slope*(x - mean_x) + rng.normal(0, noise, n)
+        return pd.DataFrame({"chemistry": name, "charge_rate_z": x, "capacity_fade_z": y})
+
+    # Chemistry A: Lower charge rates, moderate degradation (safer operating range)
+    # Chemistry B: Mid-range charge rates, higher degradation
+    # Chemistry C: Higher charge rates, variable degradation
+    df = pd.concat([
+        make_group("Chemistry A", 170, mean_x=-1.05, mean_y=-1.00, slope=0.18, x_sd=0.55, noise=0.40),
+        make_group("Chemistry B",  90, mean_x=-0.55, mean_y= 0.85, slope=0.40, x_sd=0.50, noise=0.38),
+        make_group("Chemistry C", 130, mean_x= 1.05, mean_y= 0.55, slope=0.75, x_sd=0.55, noise=0.42),
+    ], ignore_index=True)
+
+    # Mild outliers to make it feel real
+    out = pd.DataFrame({
+        "chemistry": ["Chemistry A", "Chemistry B", "Chemistry C", "Chemistry C"],
+        "charge_rate_z": [-2.3, -1.2, 2.2, 1.9],
+        "capacity_fade_z": [-2.1, 2.4, 2.6, 2.1],
+    })
+    df = pd.concat([df, out], ignore_index=True)
+
+    df["charge_rate_z"] = df["charge_rate_z"].clip(-3, 3)
+    df["capacity_fade_z"] = df["capacity_fade_z"].clip(-3, 3)
+
+    codes = pd.Categorical(df["chemistry"], categories=CHEMISTRY_ORDER, ordered=True).codes
+
+    # Marginal densities for every chemistry in one pass per axis
+    x_grid = np.linspace(-3, 3, 400)
+    y_grid = np.linspace(-3, 3, 400)
+    x_dens = smooth_hist_densities(df["charge_rate_z"].to_numpy(), codes, x_grid, bandwidth=0.18)
+    y_dens = smooth_hist_densities(df["capacity_fade_z"].to_numpy(), codes, y_grid, bandwidth=0.18)
+
+    return df, CHEMISTRY_ORDER, codes, x_grid, y_grid, x_dens, y_dens
@@ -1,12 +1,40 @@
+import hashlib
+import sys
+
 import numpy as np
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
 from pathlib import Path
+from PIL import Image
 from matplotlib.patches import Circle
+from matplotlib.collections import LineCollection, PatchCollection
 from matplotlib.colors import LinearSegmentedColormap
-from scipy.stats import gaussian_kde
 
-rng = np.random.default_rng(20251213)
+from common import PNG_KWARGS
+
+# Optional (compiled data generation). If missing, the NumPy version runs as is.
+try:
+    import numba  # type: ignore
+except Exception:
+    numba = None
+
+SEED = 20251213
+output_path = Path("../images/figure_11.png")
+
+# Skip the whole build when the existing PNG was written by this exact script,
+# seed and matplotlib version (signature kept in the PNG "Description" chunk)
+signature = hashlib.blake2b(
+    Path(__file__).read_bytes() + f"seed={SEED};mpl={matplotlib.__version__}".encode(),
+    digest_size=8,
+).hexdigest()
+if output_path.exists():
+    with Image.open(output_path) as im:
+        if im.info.get("Description") == signature:
+            print(f"Figure 11 up to date (cached): {output_path.absolute()}")
+            sys.exit(0)
+
+rng = np.random.default_rng(SEED)
 
 # Color palette
 COLORS = ["#1B435E", "#FF7D2D", "#FAC846", "#A0C382", "#5F9B8C"]  # Dark Blue, Crusta, Bright Sun, Olivine, Patina
@@ -30,36 +58,49 @@ strain   += np.where(program == "Mindfulness", -0.6, 0.0) + np.where(program ==
 activity += np.where(program == "Fitness", 0.75, 0.0)
 
 # Observables with intentionally strong correlations
-sleep_hours = 7.1 + 0.75*recovery - 0.35*strain + rng.normal(0, 0.25, size=n)
-sleep_hours = np.clip(sleep_hours, 4.5, 9.8)
-
-stress_score = 55 + 9.5*strain - 7.5*recovery + 0.10*(age-35) + rng.normal(0, 3.0, size=n)
-stress_score = np.clip(stress_score, 15, 95)
-
-caffeine_mg = 220 + 75*strain - 55*recovery + rng.normal(0, 35, size=n)
-caffeine_mg = np.clip(caffeine_mg, 0, 700)
-
-steps = 8200 + 2300*activity - 550*strain + 280*recovery + rng.normal(0, 900, size=n)
-steps = np.clip(steps, 1200, 20000)
-
-hrv_ms = 62 + 10.5*recovery - 9.0*strain + 0.00012*(steps-8000) - 0.22*(age-35) + rng.normal(0, 3.2, size=n)
-hrv_ms = np.clip(hrv_ms, 18, 130)
-
-resting_hr_bpm = 68 + 4.8*strain - 3.8*recovery - 0.00028*(steps-8000) + 0.09*(age-35) + rng.normal(0, 1.8, size=n)
-resting_hr_bpm = np.clip(resting_hr_bpm, 45, 95)
-
-caff_effect = 7.0 * (1 - np.exp(-caffeine_mg/220))
-focus_score = (
-    65
-    + 6.5*(sleep_hours-7.0)
-    + 0.22*(hrv_ms-60)
-    + 0.00035*(steps-8000)
-    - 0.34*(stress_score-55)
-    - 0.18*(resting_hr_bpm-68)
-    + 0.35*caff_effect
-    + rng.normal(0, 3.0, size=n)
+def _simulate(age, recovery, strain, activity, noise):
+    """Observable columns from the latent factors and pre-drawn noise rows."""
+    sleep_hours = 7.1 + 0.75*recovery - 0.35*strain + noise[0]
+    sleep_hours = np.clip(sleep_hours, 4.5, 9.8)
+
+    stress_score = 55 + 9.5*strain - 7.5*recovery + 0.10*(age-35) + noise[1]
+    stress_score = np.clip(stress_score, 15, 95)
+
+    caffeine_mg = 220 + 75*strain - 55*recovery + noise[2]
+    caffeine_mg = np.clip(caffeine_mg, 0, 700)
+
+    steps = 8200 + 2300*activity - 550*strain + 280*recovery + noise[3]
+    steps = np.clip(steps, 1200, 20000)
+
+    hrv_ms = 62 + 10.5*recovery - 9.0*strain + 0.00012*(steps-8000) - 0.22*(age-35) + noise[4]
+    hrv_ms = np.clip(hrv_ms, 18, 130)
+
+    resting_hr_bpm = 68 + 4.8*strain - 3.8*recovery - 0.00028*(steps-8000) + 0.09*(age-35) + noise[5]
+    resting_hr_bpm = np.clip(resting_hr_bpm, 45, 95)
+
+    caff_effect = 7.0 * (1 - np.exp(-caffeine_mg/220))
+    focus_score = (
+        65
+        + 6.5*(sleep_hours-7.0)
+        + 0.22*(hrv_ms-60)
+        + 0.00035*(steps-8000)
+        - 0.34*(stress_score-55)
+        - 0.18*(resting_hr_bpm-68)
+        + 0.35*caff_effect
+        + noise[6]
+    )
+    focus_score = np.clip(focus_score, 15, 100)
+    return sleep_hours, stress_score, caffeine_mg, steps, hrv_ms, resting_hr_bpm, focus_score
+
+
+if numba is not None:
+    _simulate = numba.njit(cache=True)(_simulate)
+
+# Noise drawn up front in the original order, so the stream is unchanged
+noise = np.stack([rng.normal(0, scale, size=n) for scale in (0.25, 3.0, 35, 900, 3.2, 1.8, 3.0)])
+sleep_hours, stress_score, caffeine_mg, steps, hrv_ms, resting_hr_bpm, focus_score = _simulate(
+    age.astype(float), recovery, strain, activity, noise
 )
-focus_score = np.clip(focus_score, 15, 100)
 
 df = pd.DataFrame({
     "program": program,
@@ -80,6 +121,9 @@ vars_sm = ["sleep_hours", "stress_score", "caffeine_mg", "hrv_ms", "steps", "foc
 X = df[vars_sm]
 k = len(vars_sm)
 
+# Above this many rows the SPLOM cells switch from alpha scatter to hexbin
+HEXBIN_MIN_POINTS = 2000
+
 # Create figure with two panels side by side
 fig = plt.figure(figsize=(22, 10), dpi=220)
 
@@ -94,42 +138,88 @@ left_panel_height = 0.90
 
 # Calculate subplot positions within the left panel
 left, bottom, right, top = 0.07, 0.07, 0.98, 0.94
-w = (right - left) / k
-h = (top - bottom) / k
+
+# Fit lines and Pearson r for every pair at once (row i = y, column j = x)
+# Column-major, so every A[:, j] below is a contiguous view
+A = np.asfortranarray(X.to_numpy(dtype=np.float64))
+mu = A.mean(axis=0)
+Ac = A - mu
+var = (Ac * Ac).mean(axis=0)
+cov = (Ac.T @ Ac) / len(A)
+r_sm = cov / np.sqrt(np.outer(var, var))
+slope = cov / var[None, :]
+intercept = mu[:, None] - slope * mu[None, :]
+
+# White -> Dark Blue ramp for hexbin cells (large n only)
+hex_cmap = LinearSegmentedColormap.from_list("density", ["#FFFFFF", COLORS[0]])
+
+def _kde1d(data, grid, h):
+    """Gaussian KDE of data evaluated on grid with bandwidth h (one pass per grid point)."""
+    out = np.empty(grid.shape[0])
+    norm = 1.0 / (data.shape[0] * h * np.sqrt(2 * np.pi))
+    for i in numba.prange(grid.shape[0]):
+        s = 0.0
+        for j in range(data.shape[0]):
+            d = (grid[i] - data[j]) / h
+            s += np.exp(-0.5 * d * d)
+        out[i] = s * norm
+    return out
+
+
+def _kde1d_numpy(data, grid, h):
+    """NumPy (grid x data) broadcast version of _kde1d."""
+    d = (grid[:, None] - data[None, :]) / h
+    return np.exp(-0.5 * d * d).sum(axis=1) / (data.shape[0] * h * np.sqrt(2 * np.pi))
+
+
+kde1d = numba.njit(parallel=True, cache=True)(_kde1d) if numba is not None else _kde1d_numpy
+
+# Diagonal KDE curves and fit-line grids, built once; Scott's rule bandwidth
+# (sample std * n^(-1/5)) as in scipy.stats.gaussian_kde
+col_min, col_max = A.min(axis=0), A.max(axis=0)
+bandwidth = A.std(axis=0, ddof=1) * len(A) ** (-1 / 5)
+x_grids, densities, fit_grids = [], [], []
+for j in range(k):
+    x_range = col_max[j] - col_min[j]
+    x_grid = np.linspace(col_min[j] - 0.1*x_range, col_max[j] + 0.1*x_range, 200)
+    x_grids.append(x_grid)
+    densities.append(kde1d(A[:, j], x_grid, bandwidth[j]))
+    fit_grids.append(np.linspace(col_min[j], col_max[j], 100))
+
+# All k x k cells in one call; edge-to-edge, no sharing (diagonals hold densities)
+axes = fig.subplots(k, k, gridspec_kw={
+    "left": left_panel_left + left_panel_width * left,
+    "right": left_panel_left + left_panel_width * right,
+    "bottom": left_panel_bottom + left_panel_height * bottom,
+    "top": left_panel_bottom + left_panel_height * top,
+    "wspace": 0,
+    "hspace": 0,
+})
 
 for i in range(k):
     for j in range(k):
-        # Calculate absolute position within the figure
-        abs_left = left_panel_left + left_panel_width * (left + j * w)
-        abs_bottom = left_panel_bottom + left_panel_height * (bottom + (k-1-i) * h)
-        abs_width = left_panel_width * w
-        abs_height = left_panel_height * h
-        
-        ax_sub = fig.add_axes([abs_left, abs_bottom, abs_width, abs_height])
+        ax_sub = axes[i, j]
         ax_sub.set_facecolor("white")
 
         if i == j:
             # KDE instead of histogram
-            data = X.iloc[:, j].to_numpy(dtype=float)
-            kde = gaussian_kde(data)
-            x_min, x_max = data.min(), data.max()
-            x_range = x_max - x_min
-            x_grid = np.linspace(x_min - 0.1*x_range, x_max + 0.1*x_range, 200)
-            density = kde(x_grid)
+            x_grid, density = x_grids[j], densities[j]
             ax_sub.fill_between(x_grid, 0, density, alpha=0.15, color=COLORS[0])
             ax_sub.plot(x_grid, density, linewidth=1.2, alpha=0.9, color=COLORS[0])
         else:
-            x = X.iloc[:, j].to_numpy(dtype=float)
-            y = X.iloc[:, i].to_numpy(dtype=float)
-            ax_sub.scatter(x, y, s=8, alpha=0.18, linewidths=0)
+            x, y = A[:, j], A[:, i]
+            if len(x) > HEXBIN_MIN_POINTS:
+                ax_sub.hexbin(x, y, gridsize=25, bins="log", mincnt=1, cmap=hex_cmap, linewidths=0)
+            else:
+                ax_sub.scatter(x, y, s=8, alpha=0.18, linewidths=0)
 
             # Fit line
-            m, b = np.polyfit(x, y, 1)
-            xg = np.linspace(np.min(x), np.max(x), 100)
+            m, b = slope[i, j], intercept[i, j]
+            xg = fit_grids[j]
             ax_sub.plot(xg, m*xg + b, linewidth=1.0, color=COLORS[0], alpha=0.6)
 
             # Pearson r
-            r = np.corrcoef(x, y)[0, 1]
+            r = r_sm[i, j]
             ax_sub.text(0.05, 0.90, f"r = {r:+.2f}", transform=ax_sub.transAxes, fontsize=8)
 
         if i < k - 1:
@@ -155,7 +245,9 @@ fig.text(0.26, 0.96, "Scatterplot matrix with fit line + r", fontsize=12, ha="ce
 ax2 = fig.add_axes([0.52, 0.15, 0.42, 0.70])
 ax2.set_facecolor("white")
 
-corr = X.corr(numeric_only=True).to_numpy()
+# Same Pearson matrix as the SPLOM panel, labels formatted in one pass
+corr = r_sm
+corr_labels = np.char.mod("%+.2f", corr)
 
 ax2.set_xlim(-0.5, k-0.5)
 ax2.set_ylim(-0.5, k-0.5)
@@ -169,25 +261,41 @@ ax2.set_yticklabels(vars_sm, fontsize=8)
 # Create diverging colormap from palette (Dark Blue -> white -> Crusta)
 cmap = LinearSegmentedColormap.from_list("diverging", [COLORS[0], "#FFFFFF", COLORS[1]])
 
+# cell borders (top, bottom, left, right of every cell) as one collection,
+# coloured in the same property-cycle order as individual plot calls
+jj, ii = np.meshgrid(np.arange(k), np.arange(k))
+x0, x1 = jj.ravel() - 0.5, jj.ravel() + 0.5
+y0, y1 = ii.ravel() - 0.5, ii.ravel() + 0.5
+borders = np.stack([
+    np.column_stack([x0, y0, x1, y0]),
+    np.column_stack([x0, y1, x1, y1]),
+    np.column_stack([x0, y0, x0, y1]),
+    np.column_stack([x1, y0, x1, y1]),
+], axis=1).reshape(-1, 2, 2)
+cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+ax2.add_collection(LineCollection(
+    borders, linewidths=0.5, alpha=0.3,
+    colors=[cycle[m % len(cycle)] for m in range(len(borders))],
+))
+
+circles, circle_r = [], []
 for i in range(k):
     for j in range(k):
         r = corr[i, j]
 
-        # cell border
-        ax2.plot([j-0.5, j+0.5], [i-0.5, i-0.5], linewidth=0.5, alpha=0.3)
-        ax2.plot([j-0.5, j+0.5], [i+0.5, i+0.5], linewidth=0.5, alpha=0.3)
-        ax2.plot([j-0.5, j-0.5], [i-0.5, i+0.5], linewidth=0.5, alpha=0.3)
-        ax2.plot([j+0.5, j+0.5], [i-0.5, i+0.5], linewidth=0.5, alpha=0.3)
-
         if i < j:
-            ax2.text(j, i, f"{r:+.2f}", ha="center", va="center", fontsize=8,
+            ax2.text(j, i, corr_labels[i, j], ha="center", va="center", fontsize=8,
                     alpha=0.95 if abs(r) > 0.25 else 0.55)
         elif i > j:
-            radius = 0.28 * abs(r)
-            color = cmap((r + 1) / 2)
-            ax2.add_patch(Circle((j, i), radius=radius, facecolor=color, edgecolor="none", alpha=0.95))
+            circles.append(Circle((j, i), radius=0.28 * abs(r)))
+            circle_r.append(r)
         else:
-            ax2.text(j, i, f"{r:+.2f}", ha="center", va="center", fontsize=8)
+            ax2.text(j, i, corr_labels[i, j], ha="center", va="center", fontsize=8)
+
+# the collection maps r through the colormap itself, in one call at draw time
+bubbles = PatchCollection(circles, cmap=cmap, norm=plt.Normalize(-1, 1), edgecolors="none", alpha=0.95)
+bubbles.set_array(np.asarray(circle_r))
+ax2.add_collection(bubbles)
 
 # colorbar
 cax = fig.add_axes([0.95, 0.22, 0.015, 0.50])
@@ -201,9 +309,9 @@ for sp in ["top", "right", "left", "bottom"]:
     ax2.spines[sp].set_visible(False)
 
 # Save combined figure
-output_path = Path("../images/figure_11.png")
 output_path.parent.mkdir(parents=True, exist_ok=True)
-fig.savefig(output_path, facecolor="white", dpi=220, bbox_inches="tight")
+fig.savefig(output_path, facecolor="white", dpi=220, bbox_inches="tight", pil_kwargs=PNG_KWARGS["pil_kwargs"],
+            metadata={**PNG_KWARGS["metadata"], "Description": signature})
 print(f"Figure 11 saved to {output_path.absolute()}")
 
 plt.close(fig)
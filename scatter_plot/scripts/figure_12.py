@@ -1,84 +1,55 @@
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 from matplotlib.gridspec import GridSpec
-from sklearn.neighbors import KernelDensity
 from matplotlib.lines import Line2D
+from matplotlib.colors import to_rgba_array
 
-rng = np.random.default_rng(12345)
+from common import PNG_KWARGS
+from ev_battery_data import load_ev_battery
 
 # Color palette
 COLORS = ["#1B435E", "#FF7D2D", "#FAC846", "#A0C382", "#5F9B8C"]  # Dark Blue, Crusta, Bright Sun, Olivine, Patina
+COLOR_RGBA = to_rgba_array(COLORS)  # parsed once, gathered per point by code
 
 # ----------------------------
-# 1) EV Battery Performance Dataset
-# X: Charge rate (C rate, standardized)
-# Y: Capacity fade after 100 cycles (standardized)
-# Groups: Chemistry A, B, C
-# Story: Chemistries separate cleanly. Within each chemistry, higher charge rate 
-#        relates differently to degradation. Marginals show one chemistry lives 
-#        in a safer operating range.
+# 1) EV Battery Performance Dataset (shared with figure_12.1.py)
 # ----------------------------
-def make_group(name, n, mean_x, mean_y, slope, x_sd=0.55, noise=0.45):
-    x = rng.normal(mean_x, x_sd, n)
-    y = mean_y + slope*(x - mean_x) + rng.normal(0, noise, n)
-    return pd.DataFrame({"chemistry": name, "charge_rate_z": x, "capacity_fade_z": y})
-
-# Chemistry A: Lower charge rates, moderate degradation (safer operating range)
-# Chemistry B: Mid-range charge rates, higher degradation
-# Chemistry C: Higher charge rates, variable degradation
-df = pd.concat([
-    make_group("Chemistry A", 170, mean_x=-1.05, mean_y=-1.00, slope=0.18, x_sd=0.55, noise=0.40),
-    make_group("Chemistry B",  90, mean_x=-0.55, mean_y= 0.85, slope=0.40, x_sd=0.50, noise=0.38),
-    make_group("Chemistry C", 130, mean_x= 1.05, mean_y= 0.55, slope=0.75, x_sd=0.55, noise=0.42),
-], ignore_index=True)
-
-# Mild outliers to make it feel real
-out = pd.DataFrame({
-    "chemistry": ["Chemistry A", "Chemistry B", "Chemistry C", "Chemistry C"],
-    "charge_rate_z": [-2.3, -1.2, 2.2, 1.9],
-    "capacity_fade_z": [-2.1, 2.4, 2.6, 2.1],
-})
-df = pd.concat([df, out], ignore_index=True)
-
-df["charge_rate_z"] = df["charge_rate_z"].clip(-3, 3)
-df["capacity_fade_z"] = df["capacity_fade_z"].clip(-3, 3)
+df, chemistry_order, codes, x_grid, y_grid, x_dens, y_dens = load_ev_battery()
 
 # ----------------------------
-# Helpers: 1D KDE via histogram smoothing, regression + CI band
+# Helpers: marginal KDE panels,
+# regression + CI band
 # ----------------------------
-def smooth_hist_density(values, grid, bandwidth=0.18):
-    bins = np.linspace(grid.min(), grid.max(), 70)
-    hist, edges = np.histogram(values, bins=bins, density=True)
-    centers = (edges[:-1] + edges[1:]) / 2
-
-    dx = centers[1] - centers[0]
-    kx = np.arange(-int(4*bandwidth/dx), int(4*bandwidth/dx)+1) * dx
-    kernel = np.exp(-0.5*(kx/bandwidth)**2)
-    kernel /= kernel.sum() * dx
-
-    sm = np.convolve(hist, kernel, mode="same")
-    return np.interp(grid, centers, sm, left=0, right=0)
-
-def fit_line_and_ci(x, y, x_grid):
+def fit_lines_and_ci(x, y, codes, n_grid=200):
+    """
+    OLS line + 95% mean CI for every group at once, from grouped sums.
+    Each group's line spans its own x range; returns (x_grid, y_grid, lo, hi)
+    arrays of shape (n_groups, n_grid).
+    """
     x = np.asarray(x); y = np.asarray(y)
-    n = len(x)
-    xbar = x.mean()
-    Sxx = np.sum((x - xbar)**2)
-
-    m, b = np.polyfit(x, y, 1)
-    yhat = m*x + b
-    s2 = np.sum((y - yhat)**2) / max(n - 2, 1)
-
-    se_mean = np.sqrt(s2 * (1/n + (x_grid - xbar)**2 / max(Sxx, 1e-12)))
-    y_grid = m*x_grid + b
+    n_groups = codes.max() + 1
+    n = np.bincount(codes, minlength=n_groups)
+    xbar = np.bincount(codes, x, n_groups) / n
+    ybar = np.bincount(codes, y, n_groups) / n
+    dx = x - xbar[codes]
+    Sxx = np.bincount(codes, dx*dx, n_groups)
+    m = np.bincount(codes, dx*(y - ybar[codes]), n_groups) / Sxx
+    b = ybar - m*xbar
+    s2 = np.bincount(codes, (y - (m[codes]*x + b[codes]))**2, n_groups) / np.maximum(n - 2, 1)
+
+    x_min = np.full(n_groups, np.inf); np.minimum.at(x_min, codes, x)
+    x_max = np.full(n_groups, -np.inf); np.maximum.at(x_max, codes, x)
+    x_grid = np.linspace(x_min, x_max, n_grid, axis=1)
+
+    se_mean = np.sqrt(s2[:, None] * (1/n[:, None] + (x_grid - xbar[:, None])**2 / np.maximum(Sxx, 1e-12)[:, None]))
+    y_grid = m[:, None]*x_grid + b[:, None]
     ci = 1.96 * se_mean
-    return y_grid, y_grid - ci, y_grid + ci
+    return x_grid, y_grid, y_grid - ci, y_grid + ci
 
-def add_marginals(ax_top, ax_right, xvals, yvals, codes, x_grid, y_grid, color_fn):
-    for code in np.unique(codes):
-        d = smooth_hist_density(xvals[codes == code], x_grid, bandwidth=0.18)
+def add_marginals(ax_top, ax_right, x_dens, y_dens, x_grid, y_grid, color_fn):
+    groups, x_rows = x_dens
+    for code, d in zip(groups, x_rows):
         ax_top.fill_between(x_grid, 0, d, alpha=0.22, color=color_fn(code))
         ax_top.plot(x_grid, d, linewidth=1.2, alpha=0.9, color=color_fn(code))
     ax_top.set_xlim(-3, 3)
@@ -86,8 +57,8 @@ def add_marginals(ax_top, ax_right, xvals, yvals, codes, x_grid, y_grid, color_f
     for sp in ["top", "right", "left", "bottom"]:
         ax_top.spines[sp].set_visible(False)
 
-    for code in np.unique(codes):
-        d = smooth_hist_density(yvals[codes == code], y_grid, bandwidth=0.18)
+    groups, y_rows = y_dens
+    for code, d in zip(groups, y_rows):
         ax_right.fill_betweenx(y_grid, 0, d, alpha=0.22, color=color_fn(code))
         ax_right.plot(d, y_grid, linewidth=1.2, alpha=0.9, color=color_fn(code))
     ax_right.set_ylim(-3, 3)
@@ -98,17 +69,10 @@ def add_marginals(ax_top, ax_right, xvals, yvals, codes, x_grid, y_grid, color_f
 # ----------------------------
 # 2) Three panels figure
 # ----------------------------
-chemistry_order = ["Chemistry A", "Chemistry B", "Chemistry C"]
-cat = pd.Categorical(df["chemistry"], categories=chemistry_order, ordered=True)
-codes = cat.codes
-
 # Use custom color palette
 color = lambda code: COLORS[code % len(COLORS)]
 
-x_grid = np.linspace(-3, 3, 400)
-y_grid = np.linspace(-3, 3, 400)
-
-fig = plt.figure(figsize=(14.6, 5.2), dpi=220)
+fig = plt.figure(figsize=(14.6, 5.2), dpi=100)
 outer = GridSpec(1, 3, figure=fig, width_ratios=[1.0, 1.0, 1.0], wspace=0.25)
 
 def joint_axes(spec):
@@ -130,8 +94,8 @@ ax1, ax1_top, ax1_right = joint_axes(outer[0, 0])
 ax1_top.axis("off")
 ax1_right.axis("off")
 # Use explicit colors to match other panels
-scatter_colors_p1 = [color(c) for c in codes]
-ax1.scatter(df["charge_rate_z"], df["capacity_fade_z"], s=18, alpha=0.60, c=scatter_colors_p1, edgecolors="none")
+scatter_colors = COLOR_RGBA[np.asarray(codes) % len(COLOR_RGBA)]  # shared by all three panels
+ax1.scatter(df["charge_rate_z"], df["capacity_fade_z"], s=18, alpha=0.60, c=scatter_colors, edgecolors="none")
 ax1.set_xlim(-3, 3); ax1.set_ylim(-3, 3)
 ax1.set_xlabel("Charge rate (standardized)"); ax1.set_ylabel("Capacity fade after 100 cycles (standardized)")
 ax1.grid(True, linestyle=":", linewidth=0.7, alpha=0.45)
@@ -140,9 +104,7 @@ ax1.legend(handles, chemistry_order, frameon=True, fontsize=8, loc="upper left")
 # Panel 2: joint+marginals + cluster cloud with centroids only (was Panel 3)
 ax2, ax2_top, ax2_right = joint_axes(outer[0, 1])
 
-# Use explicit colors to match centroids
-scatter_colors_p2 = [color(c) for c in codes]
-ax2.scatter(df["charge_rate_z"], df["capacity_fade_z"], s=16, alpha=0.35, c=scatter_colors_p2, edgecolors="none")
+ax2.scatter(df["charge_rate_z"], df["capacity_fade_z"], s=16, alpha=0.35, c=scatter_colors, edgecolors="none")
 
 # Plot centroids (mean x, mean y) for each cluster
 for i, chem in enumerate(chemistry_order):
@@ -157,33 +119,24 @@ ax2.set_xlabel("Charge rate (standardized)"); ax2.set_ylabel("Capacity fade afte
 ax2.grid(True, linestyle=":", linewidth=0.7, alpha=0.45)
 ax2.legend(handles, chemistry_order, frameon=True, fontsize=8, loc="upper left")
 
-add_marginals(ax2_top, ax2_right,
-              df["charge_rate_z"].to_numpy(), df["capacity_fade_z"].to_numpy(), codes,
-              x_grid, y_grid, color)
+add_marginals(ax2_top, ax2_right, x_dens, y_dens, x_grid, y_grid, color)
 
 # Panel 3: joint+marginals + per-chemistry regressions (was Panel 1, now last)
 ax3, ax3_top, ax3_right = joint_axes(outer[0, 2])
-# Use explicit colors to match fit lines
-scatter_colors_p3 = [color(c) for c in codes]
-ax3.scatter(df["charge_rate_z"], df["capacity_fade_z"], s=18, alpha=0.55, c=scatter_colors_p3, edgecolors="none")
+ax3.scatter(df["charge_rate_z"], df["capacity_fade_z"], s=18, alpha=0.55, c=scatter_colors, edgecolors="none")
 
-# Fit lines only within data range for each chemistry
-for i, chem in enumerate(chemistry_order):
-    d = df[df["chemistry"] == chem]
-    x_min, x_max = d["charge_rate_z"].min(), d["charge_rate_z"].max()
-    x_range = np.linspace(x_min, x_max, 200)
-    yg, lo, hi = fit_line_and_ci(d["charge_rate_z"], d["capacity_fade_z"], x_range)
-    ax3.fill_between(x_range, lo, hi, alpha=0.15, color=color(i))
-    ax3.plot(x_range, yg, linewidth=2.0, alpha=0.9, color=color(i))
+# Fit lines only within data range for each chemistry (all fits in one pass)
+x_fit, y_fit, lo_fit, hi_fit = fit_lines_and_ci(df["charge_rate_z"], df["capacity_fade_z"], codes)
+for i in range(len(chemistry_order)):
+    ax3.fill_between(x_fit[i], lo_fit[i], hi_fit[i], alpha=0.15, color=color(i))
+    ax3.plot(x_fit[i], y_fit[i], linewidth=2.0, alpha=0.9, color=color(i))
 
 ax3.set_xlim(-3, 3); ax3.set_ylim(-3, 3)
 ax3.set_xlabel("Charge rate (standardized)"); ax3.set_ylabel("Capacity fade after 100 cycles (standardized)")
 ax3.grid(True, linestyle=":", linewidth=0.7, alpha=0.45)
 ax3.legend(handles, chemistry_order, frameon=True, fontsize=8, loc="upper left")
 
-add_marginals(ax3_top, ax3_right,
-              df["charge_rate_z"].to_numpy(), df["capacity_fade_z"].to_numpy(), codes,
-              x_grid, y_grid, color)
+add_marginals(ax3_top, ax3_right, x_dens, y_dens, x_grid, y_grid, color)
 
 fig.suptitle("EV Battery Performance: Charge rate vs Capacity fade across chemistries",
              fontsize=12, y=0.98)
@@ -191,7 +144,7 @@ fig.suptitle("EV Battery Performance: Charge rate vs Capacity fade across chemis
 # Save the figure
 output_path = Path("../images/figure_12.png")
 output_path.parent.mkdir(parents=True, exist_ok=True)
-fig.savefig(output_path, facecolor="white", dpi=220)
+fig.savefig(output_path, facecolor="white", dpi=220, **PNG_KWARGS)
 print(f"Figure 12 saved to {output_path.absolute()}")
 
 plt.close(fig)
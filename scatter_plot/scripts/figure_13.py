@@ -1,6 +1,5 @@
-import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
-import matplotlib
 from pathlib import Path
 import sys
 
@@ -8,17 +7,20 @@ import sys
 script_dir = Path(__file__).parent
 sys.path.append(str(script_dir.parent.parent / "scatter plot"))
 from theme_color import COLOR_DICT
+from common import PNG_KWARGS, setup_style
 
 # Set font to Inter, with fallback to sans-serif if not available
-plt.rcParams['font.family'] = 'sans-serif'
-matplotlib.rcParams['font.sans-serif'] = ['Inter', 'Arial', 'Helvetica', 'DejaVu Sans', 'sans-serif']
+setup_style()
 
 # Load the dataset
 data_path = script_dir.parent.parent / "scatter plot" / "data" / "support_cost_scatter_dataset.csv"
-df = pd.read_csv(data_path)
-
-avg = df["support_cost_per_ticket_usd"].mean()
-mask_above_avg = df["support_cost_per_ticket_usd"] > avg
+# (a few hundred rows: numpy reads them directly, no pandas import needed)
+data = np.genfromtxt(data_path, delimiter=",", names=True,
+                     usecols=("tickets_per_week", "support_cost_per_ticket_usd"))
+x = data["tickets_per_week"]
+y = data["support_cost_per_ticket_usd"]
+avg = y.mean()
+mask_above_avg = y > avg
 
 # Create figure with square subplots
 fig = plt.figure(figsize=(12, 5), dpi=220)
@@ -42,7 +44,7 @@ ax1 = fig.add_axes([left_margin, bottom_margin, panel_size, panel_size])
 ax2 = fig.add_axes([left_margin + panel_size + spacing, bottom_margin, panel_size, panel_size])
 
 # First panel: All points same color, no reference line, no annotation
-ax1.scatter(df["tickets_per_week"], df["support_cost_per_ticket_usd"], 
+ax1.scatter(x, y, 
            alpha=0.75, s=45, color=COLOR_DICT["Dark Blue"])
 ax1.set_xlabel("Tickets handled per week")
 ax1.set_ylabel("Support cost per ticket (USD)")
@@ -54,9 +56,9 @@ ax1.set_position([left_margin, bottom_margin, panel_size, panel_size])
 ax1.grid(True, linestyle=":", linewidth=0.8, alpha=0.7)
 
 # Second panel: Colored points with reference line and annotation
-ax2.scatter(df.loc[~mask_above_avg, "tickets_per_week"], df.loc[~mask_above_avg, "support_cost_per_ticket_usd"], 
+ax2.scatter(x[~mask_above_avg], y[~mask_above_avg], 
            alpha=0.75, s=45, color=COLOR_DICT["Dark Blue"], label='Below average')
-ax2.scatter(df.loc[mask_above_avg, "tickets_per_week"], df.loc[mask_above_avg, "support_cost_per_ticket_usd"], 
+ax2.scatter(x[mask_above_avg], y[mask_above_avg], 
            alpha=0.9, s=55, color=COLOR_DICT["Crusta"], label='Above average')
 
 # Subtle average line: medium gray, thin, dashed
@@ -73,7 +75,7 @@ ax2.set_position([left_margin + panel_size + spacing, bottom_margin, panel_size,
 ax2.grid(True, linestyle=":", linewidth=0.8, alpha=0.7)
 
 output_path = Path("../images/figure_13.png")
-fig.savefig(output_path, facecolor="white", dpi=220)
+fig.savefig(output_path, facecolor="white", dpi=220, **PNG_KWARGS)
 plt.close(fig)
 
 print("Saved:", output_path)
@@ -4,12 +4,15 @@ import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle
 from matplotlib.lines import Line2D
 from pathlib import Path
-from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.colors import LinearSegmentedColormap, to_rgba_array
+
+from common import PNG_KWARGS
 
 rng = np.random.default_rng(20251213)
 
 # Color palette
 COLORS = ["#1B435E", "#FF7D2D", "#FAC846", "#A0C382", "#5F9B8C"]  # Dark Blue, Crusta, Bright Sun, Olivine, Patina
+COLOR_RGBA = to_rgba_array(COLORS)  # parsed once, gathered per point by code
 
 # ------------------------------
 # Synthetic dataset: "Average adult BMI by country (men vs women)"
@@ -24,44 +27,38 @@ def make_names(prefix, n):
     syll = ["land", "ia", "stan", "terra", "vale", "nia", "ford", "mark", "ton", "ria"]
     return [f"{prefix}-{i+1:02d}{syll[i % len(syll)]}" for i in range(n)]
 
-country_rows = []
+# (mean men, mean women, sd) per region
+region_params = {
+    "North America":  (28.8, 27.2, 1.6),
+    "Latin America":  (27.4, 26.6, 1.7),
+    "Europe":         (26.6, 25.6, 1.6),
+    "Africa":         (23.8, 24.6, 1.9),
+    "Middle East":    (28.6, 29.2, 1.8),
+    "South Asia":     (23.2, 23.8, 1.4),
+    "East Asia":      (23.6, 22.8, 1.2),
+    "Southeast Asia": (24.0, 23.6, 1.3),
+    "Oceania":        (29.4, 28.2, 1.8),
+}
+
+males, females, names = [], [], []
 for reg, n in zip(regions, region_sizes):
-    if reg == "North America":
-        mu_m, mu_f, sd = 28.8, 27.2, 1.6
-    elif reg == "Latin America":
-        mu_m, mu_f, sd = 27.4, 26.6, 1.7
-    elif reg == "Europe":
-        mu_m, mu_f, sd = 26.6, 25.6, 1.6
-    elif reg == "Africa":
-        mu_m, mu_f, sd = 23.8, 24.6, 1.9
-    elif reg == "Middle East":
-        mu_m, mu_f, sd = 28.6, 29.2, 1.8
-    elif reg == "South Asia":
-        mu_m, mu_f, sd = 23.2, 23.8, 1.4
-    elif reg == "East Asia":
-        mu_m, mu_f, sd = 23.6, 22.8, 1.2
-    elif reg == "Southeast Asia":
-        mu_m, mu_f, sd = 24.0, 23.6, 1.3
-    else:  # Oceania
-        mu_m, mu_f, sd = 29.4, 28.2, 1.8
+    mu_m, mu_f, sd = region_params[reg]
 
     # correlated male/female BMI within each region
     male = rng.normal(mu_m, sd, n)
     female = male - rng.normal(1.0, 0.9, n) + rng.normal(mu_f - mu_m, 0.6, n)
 
-    male = np.clip(male, 18.0, 35.5)
-    female = np.clip(female, 18.0, 35.5)
-
-    names = make_names(reg.split()[0], n)
-    for i in range(n):
-        country_rows.append({
-            "country": names[i],
-            "region": reg,
-            "bmi_men": float(np.round(male[i], 1)),
-            "bmi_women": float(np.round(female[i], 1)),
-        })
+    males.append(male)
+    females.append(female)
+    names += make_names(reg.split()[0], n)
 
-df = pd.DataFrame(country_rows)
+# One DataFrame from whole columns (no per-row dicts)
+df = pd.DataFrame({
+    "country": names,
+    "region": np.repeat(regions, region_sizes),
+    "bmi_men": np.round(np.clip(np.concatenate(males), 18.0, 35.5), 1),
+    "bmi_women": np.round(np.clip(np.concatenate(females), 18.0, 35.5), 1),
+})
 
 # Intentional annotatable "outliers" (synthetic)
 extras = pd.DataFrame([
@@ -84,7 +81,7 @@ df.to_csv(csv_path, index=False)
 reg_cat = pd.Categorical(df["region"], categories=regions, ordered=True)
 codes = reg_cat.codes
 # Map codes to colors from palette
-scatter_colors = [COLORS[i % len(COLORS)] for i in codes]
+scatter_colors = COLOR_RGBA[np.asarray(codes) % len(COLOR_RGBA)]
 
 # Legend (regions) - create once for both panels
 handles, labels = [], []
@@ -95,7 +92,7 @@ for i, r in enumerate(regions):
     labels.append(r)
 
 # Create two-panel figure
-fig = plt.figure(figsize=(14.8, 6.6), dpi=220)
+fig = plt.figure(figsize=(14.8, 6.6), dpi=100)
 
 # Panel A: Scatter only (before annotation)
 ax1 = fig.add_axes([0.06, 0.12, 0.40, 0.78])
@@ -165,10 +162,12 @@ ax2.legend(handles, labels, title="Region", frameon=True, fontsize=6, title_font
 
 # Annotate outliers
 to_annotate = ["Gulf-terra", "Coastal-nia", "Metro-ia", "Riceford"]
+by_country = df.set_index("country")  # one index build instead of a scan per name
+region_to_idx = {reg: i for i, reg in enumerate(regions)}
 for name in to_annotate:
-    r = df[df["country"] == name].iloc[0]
+    r = by_country.loc[name]
     # Get the color for this point's region
-    region_idx = regions.index(r["region"])
+    region_idx = region_to_idx[r["region"]]
     point_color = COLORS[region_idx % len(COLORS)]
     ax2.scatter([r["bmi_men"]], [r["bmi_women"]], s=60, alpha=0.95, c=point_color, zorder=4)
     # Shorter arrow for Gulf-terra
@@ -192,7 +191,7 @@ for name in to_annotate:
     )
 
 output_path = Path("../images/figure_14.png")
-fig.savefig(output_path, facecolor="white", dpi=220)
+fig.savefig(output_path, facecolor="white", dpi=220, **PNG_KWARGS)
 plt.close(fig)
 
 print("Saved:", csv_path, output_path)
@@ -1,12 +1,14 @@
-import pandas as pd
+import shutil
 import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 from matplotlib.colors import LinearSegmentedColormap
 
-# Set font to Inter
-plt.rcParams['font.family'] = 'Inter'
-plt.rcParams['font.sans-serif'] = ['Inter', 'sans-serif']
+from common import MASTER_DTYPES, PNG_KWARGS, WHITE_TO_THEME_CMAP, load_csv, setup_style, smart_scatter
+
+# Set font to Inter (first installed fallback otherwise)
+setup_style()
 
 # Color palette
 COLORS = ["#1B435E", "#FF7D2D", "#FAC846", "#A0C382", "#5F9B8C"]  # Dark Blue, Crusta, Bright Sun, Olivine, Patina
@@ -14,7 +16,7 @@ COLORS = ["#1B435E", "#FF7D2D", "#FAC846", "#A0C382", "#5F9B8C"]  # Dark Blue, C
 # Load the synthetic dataset
 script_dir = Path(__file__).parent
 data_path = script_dir.parent / "data" / "synthetic_scatter_master_dataset.csv"
-df = pd.read_csv(data_path)
+df = load_csv(data_path, dtype=MASTER_DTYPES)
 
 # Subset: week8 + moderate severity (gives a clearer positive slope)
 wk8 = df[df["visit"] == "week8"].copy()
@@ -22,19 +24,20 @@ d = wk8[wk8["severity_band"] == "moderate"].copy()
 
 # Create more "country-like" units by splitting each site into 4 pseudo-countries (deterministic)
 d["country_bucket"] = (d["subject_id"] % 4).astype(int)
-d["country"] = d["site_id"] + "-" + d["country_bucket"].astype(str)
-
-# Aggregate to one dot per pseudo-country
-g = (
-    d.groupby(["region", "country"], as_index=False)
-     .agg(
-         n=("subject_id", "nunique"),
-         exposure_p90=("exposure_auc", lambda x: np.quantile(x, 0.90)),
-         response_mean=("response", "mean"),
-         cost_p90=("cost_usd", lambda x: np.quantile(x, 0.90)),
-         adverse_rate=("adverse_event", "mean"),
-     )
-)
+
+# Aggregate to one dot per pseudo-country (built-in grouped kernels, no lambdas);
+# (site_id, bucket) sorts like the "site_id-bucket" label built afterwards
+gb = d.groupby(["region", "site_id", "country_bucket"])
+p90 = gb[["exposure_auc", "cost_usd"]].quantile(0.90)
+means = gb[["response", "adverse_event"]].mean()
+g = pd.DataFrame({
+    "n": gb["subject_id"].nunique(),
+    "exposure_p90": p90["exposure_auc"],
+    "response_mean": means["response"],
+    "cost_p90": p90["cost_usd"],
+    "adverse_rate": means["adverse_event"],
+}).reset_index()
+g["country"] = g["site_id"] + "-" + g["country_bucket"].astype(str)
 
 # Keep small groups too (to increase point count) but avoid singletons
 g = g[g["n"] >= 3].copy().reset_index(drop=True)
@@ -44,9 +47,10 @@ x = g["exposure_p90"].to_numpy()
 y = g["response_mean"].to_numpy()
 
 # Bubble size: extreme scaling based on n and adverse rate (to create a few monsters)
-n = g["n"].to_numpy().astype(float)
-s_raw = (n**3.1) * (1.0 + 1.2 * g["adverse_rate"].to_numpy())
-s = 10 + 4200 * (s_raw - s_raw.min()) / (s_raw.max() - s_raw.min() + 1e-9)
+# (float32 throughout: Agg consumes marker sizes at single precision anyway)
+n = g["n"].to_numpy(dtype=np.float32)
+s_raw = (n**np.float32(3.1)) * (np.float32(1.0) + np.float32(1.2) * g["adverse_rate"].to_numpy(dtype=np.float32))
+s = 10 + 4200 * (s_raw - s_raw.min()) / (s_raw.max() - s_raw.min() + np.float32(1e-9))
 s = np.clip(s, 10, 5200)
 
 # Color: region
@@ -64,8 +68,8 @@ y_line = a + b * lx_line
 resid = y - (a + b * lx)
 abs_resid = np.abs(resid)
 
-k = 10
-out_idx = np.argsort(abs_resid)[-k:]
+k = min(10, abs_resid.size)
+out_idx = np.argpartition(abs_resid, -k)[-k:]  # top-k, order not needed for the mask
 out_mask = np.zeros_like(abs_resid, dtype=bool)
 out_mask[out_idx] = True
 out_mask[int(np.argmax(x))] = True
@@ -74,20 +78,23 @@ out_mask[int(np.argmax(y))] = True
 
 labels = g["country"].to_numpy()
 
+labels_str = labels.astype(str)
+has_11_1 = np.char.find(labels_str, "11-1") >= 0
+
 # Exclude "11-1" from being highlighted as an outlier
-for idx in range(len(labels)):
-    if "11-1" in labels[idx]:
-        out_mask[idx] = False
+out_mask &= ~has_11_1
 
 # Plot
 plt.figure(figsize=(13.2, 6.6))
 
 # Map region codes to colors
-scatter_colors = np.array([COLORS[i % len(COLORS)] for i in region_codes])
+palette = np.array(COLORS)
+scatter_colors = palette[region_codes % len(palette)]
 
-# Non-outliers
-plt.scatter(
-    x[~out_mask], y[~out_mask],
+# Non-outliers (binned instead if the pseudo-country count ever gets large)
+smart_scatter(
+    plt.gca(), x[~out_mask], y[~out_mask],
+    hexbin_kw={"xscale": "log", "cmap": WHITE_TO_THEME_CMAP},
     s=s[~out_mask],
     c=scatter_colors[~out_mask],
     alpha=0.55,
@@ -119,14 +126,14 @@ x_min, x_max = x.min(), x.max()
 x_max_expanded = x_max * 1.2
 plt.xlim(x_min * 0.9, x_max_expanded)
 
-# Label outliers (positioned to the right of data points)
-for idx in np.where(out_mask)[0]:
-    # Skip labeling "EU-02-01" (or similar pattern)
-    if "EU-02-01" in labels[idx] or "EU-02-1" in labels[idx]:
-        continue
-    # Skip labeling "11-1"
-    if "11-1" in labels[idx]:
-        continue
+# Label outliers (positioned to the right of data points),
+# skipping "EU-02-01" (or similar pattern) and "11-1"
+skip_label = (
+    (np.char.find(labels_str, "EU-02-01") >= 0)
+    | (np.char.find(labels_str, "EU-02-1") >= 0)
+    | has_11_1
+)
+for idx in np.where(out_mask & ~skip_label)[0]:
     # Position labels to the right with small proportional offset (works with log scale)
     # Multiply x-value by a small factor for consistent visual spacing on log scale
     offset = x[idx] * 0.02  # 2% of x-value for very close, consistent spacing
@@ -145,14 +152,14 @@ plt.title("More dots (pseudo-countries) + stronger slope + clearly highlighted o
 
 plt.tight_layout()
 
-# Save the plot BEFORE showing
-images_dir = Path("/Users/dullmanatee/PycharmProjects/scatter/Scatter/images")
+# Save the plot
+images_dir = Path("../images")
+images_dir.mkdir(parents=True, exist_ok=True)
 output_path1 = images_dir / "figure_1_bubble_scatter.png"
 output_path2 = images_dir / "bubble_scatter_more_data_outliers_clear_slope.png"
-plt.savefig(output_path1, dpi=220, facecolor="white")
-plt.savefig(output_path2, dpi=220, facecolor="white")
+plt.savefig(output_path1, dpi=220, facecolor="white", **PNG_KWARGS)
+shutil.copyfile(output_path1, output_path2)  # same figure, so render it only once
 print(f"Saved: {output_path1}")
 print(f"Saved: {output_path2}")
 
-plt.show()
 plt.close()
\ No newline at end of file
@@ -1,16 +1,24 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
-from PIL import Image
-import tempfile
-import os
+
+from common import PNG_KWARGS
 
 rng = np.random.default_rng(11)
 
 # Color palette
 COLORS = ["#1B435E", "#FF7D2D", "#FAC846", "#A0C382", "#5F9B8C"]  # Dark Blue, Crusta, Bright Sun, Olivine, Patina
 
-def make_panel(kind: str, title: str, out_path: Path):
+# Each panel keeps the frame of its former standalone 2.35 x 2.1 in figure;
+# frames sit side by side, one cropped panel width (axes + 0.1 in padding on
+# each side) plus an 18 px gap apart
+PANEL_SIZE = (2.35, 2.1)
+PANEL_AXES = (0.18, 0.18, 0.75, 0.70)
+PANEL_STEP = PANEL_AXES[2] * PANEL_SIZE[0] + 2 * 0.1 + 18 / 220
+PANELS = [("curve_up", "Upward curve"), ("cluster", "Clustering"), ("outlier", "Outlier")]
+
+
+def make_panel(kind: str, ax: plt.Axes):
     if kind == "curve_up":
         x = np.linspace(1.2, 8.8, 18) + rng.normal(0, 0.25, 18)
         # Upward curve (convex)
@@ -42,9 +50,6 @@ def make_panel(kind: str, title: str, out_path: Path):
     else:
         raise ValueError("Unknown kind")
 
-    fig = plt.figure(figsize=(2.35, 2.1), dpi=220)
-    ax = fig.add_axes([0.18, 0.18, 0.75, 0.70])
-
     if kind == "curve_up":
         ax.scatter(x, y, s=11, color=COLORS[0])
         ax.set_xlim(0, 10)
@@ -115,38 +120,22 @@ def make_panel(kind: str, title: str, out_path: Path):
                 arrowprops=dict(arrowstyle="->", lw=1.0), 
                 clip_on=False)
 
-    fig.suptitle(title, fontsize=9, y=0.98)
-    fig.savefig(out_path, bbox_inches="tight", facecolor="white")
-    plt.close(fig)
-
-# Create temporary directory for panel images
-with tempfile.TemporaryDirectory() as tmpdir:
-    paths = [
-        Path(tmpdir) / "panel_curve_up.png",
-        Path(tmpdir) / "panel_cluster.png",
-        Path(tmpdir) / "panel_outlier.png",
-    ]
-
-    make_panel("curve_up", "Upward curve", paths[0])
-    make_panel("cluster", "Clustering", paths[1])
-    make_panel("outlier", "Outlier", paths[2])
-
-    # Stitch into one image
-    imgs = [Image.open(p).convert("RGBA") for p in paths]
-    spacing = 18
-    w = sum(im.width for im in imgs) + spacing * (len(imgs) - 1)
-    h = max(im.height for im in imgs)
-
-    canvas = Image.new("RGBA", (w, h), (255, 255, 255, 255))
-    xoff = 0
-    for im in imgs:
-        yoff = (h - im.height) // 2
-        canvas.paste(im, (xoff, yoff))
-        xoff += im.width + spacing
-
-    # Save final figure
-    output_path = Path("../images/figure_2.png")
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    canvas.convert("RGB").save(output_path, "PNG")
-    print(f"Figure 2 saved to {output_path.absolute()}")
-
+fig_w = PANEL_SIZE[0] + PANEL_STEP * (len(PANELS) - 1)
+fig = plt.figure(figsize=(fig_w, PANEL_SIZE[1]), dpi=220)
+for k, (kind, title) in enumerate(PANELS):
+    left = k * PANEL_STEP
+    ax = fig.add_axes([
+        (left + PANEL_AXES[0] * PANEL_SIZE[0]) / fig_w, PANEL_AXES[1],
+        PANEL_AXES[2] * PANEL_SIZE[0] / fig_w, PANEL_AXES[3],
+    ])
+    make_panel(kind, ax)
+    # Title centred over the panel frame, as its suptitle was
+    fig.text((left + PANEL_SIZE[0] / 2) / fig_w, 0.98, title, fontsize=9, ha="center", va="top")
+
+# Save final figure
+output_path = Path("../images/figure_2.png")
+output_path.parent.mkdir(parents=True, exist_ok=True)
+fig.savefig(output_path, bbox_inches="tight", facecolor="white", **PNG_KWARGS)
+print(f"Figure 2 saved to {output_path.absolute()}")
+
+plt.close(fig)
@@ -1,20 +1,16 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap, Normalize
 from pathlib import Path
 
+from common import PNG_KWARGS, WHITE_TO_THEME_CMAP
+
 rng = np.random.default_rng(2025)
 
 # Color palette
 COLORS = ["#1B435E", "#FF7D2D", "#FAC846", "#A0C382", "#5F9B8C"]  # Dark Blue, Crusta, Bright Sun, Olivine, Patina
 
-# Create custom colormap from white to theme color
-theme_color = COLORS[0]  # "#1B435E"
-# Convert hex to RGB (normalized 0-1)
-theme_rgb = tuple(int(theme_color[i:i+2], 16)/255.0 for i in (1, 3, 5))
-white_rgb = (1.0, 1.0, 1.0)
-# Create colormap from white (low density) to theme color (high density)
-custom_cmap = LinearSegmentedColormap.from_list('white_to_theme', [white_rgb, theme_rgb], N=256)
+# Colormap from white (low density) to theme color (high density)
+custom_cmap = WHITE_TO_THEME_CMAP
 
 # =========================
 # Figure 3: Many-point strategies (4 panels in 2x2 grid)
@@ -90,8 +86,8 @@ clean_axes(ax)
 # Panel 3: 2D histogram
 ax = axes[2]
 ax.set_facecolor("white")
-H, xedges, yedges, im = ax.hist2d(x, y, bins=30, cmap=custom_cmap, vmin=0)
-im.set_clim(vmin=0)
+H, xedges, yedges = np.histogram2d(x, y, bins=30)
+ax.pcolormesh(xedges, yedges, H.T, cmap=custom_cmap, vmin=0)
 ax.set_title("2D histogram", fontsize=9)
 clean_axes(ax)
 
@@ -105,7 +101,7 @@ clean_axes(ax)
 # Save the figure
 output_path = Path("../images/figure_3.png")
 output_path.parent.mkdir(parents=True, exist_ok=True)
-fig.savefig(output_path, facecolor="white", dpi=220)
+fig.savefig(output_path, facecolor="white", dpi=220, **PNG_KWARGS)
 print(f"Figure 3 saved to {output_path.absolute()}")
 
 plt.close(fig)
@@ -6,6 +6,8 @@ import statsmodels.api as sm
 from statsmodels.nonparametric.smoothers_lowess import lowess
 import tempfile
 
+from common import PNG_KWARGS
+
 # Color palette
 COLORS = ["#1B435E", "#FF7D2D", "#FAC846", "#A0C382", "#5F9B8C"]  # Dark Blue, Crusta, Bright Sun, Olivine, Patina
 
@@ -50,7 +52,8 @@ def save_single_panel(figpath: Path, title: str, xlabel: str, ylabel: str, draw_
     ax.set_xlabel(xlabel)
     ax.set_ylabel(ylabel)
     ax.grid(True, linestyle=":", linewidth=0.6, alpha=0.5)
-    fig.savefig(figpath, facecolor="white")
+    # Scratch panel, read straight back for stitching: skip deflate entirely
+    fig.savefig(figpath, facecolor="white", pil_kwargs={"compress_level": 0})
     plt.close(fig)
 
 # Create temporary directory for panel images
@@ -136,6 +139,6 @@ with tempfile.TemporaryDirectory() as tmpdir:
     # Save final figure
     output_path = Path("../images/figure_4.png")
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    canvas.save(output_path)
+    canvas.save(output_path, **PNG_KWARGS["pil_kwargs"])
     print(f"Figure 4 saved to {output_path.absolute()}")
 
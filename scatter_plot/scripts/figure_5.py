@@ -2,6 +2,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from common import PNG_KWARGS
+
 rng = np.random.default_rng(123)
 
 # Color palette
@@ -43,7 +45,7 @@ for ax in top_axes:
 # Save the figure
 output_path = Path("../images/figure_5.png")
 output_path.parent.mkdir(parents=True, exist_ok=True)
-fig.savefig(output_path, facecolor="white", dpi=220, bbox_inches="tight")
+fig.savefig(output_path, facecolor="white", dpi=220, bbox_inches="tight", **PNG_KWARGS)
 print(f"Figure 5 saved to {output_path.absolute()}")
 
 plt.close(fig)
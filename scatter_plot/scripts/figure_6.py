@@ -2,6 +2,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from common import PNG_KWARGS
+
 rng = np.random.default_rng(123)
 
 # Color palette
@@ -80,7 +82,7 @@ fig.suptitle(
 # Save the figure
 output_path = Path("../images/figure_6.png")
 output_path.parent.mkdir(parents=True, exist_ok=True)
-fig.savefig(output_path, facecolor="white", dpi=220, bbox_inches="tight")
+fig.savefig(output_path, facecolor="white", dpi=220, bbox_inches="tight", **PNG_KWARGS)
 print(f"Figure 6 saved to {output_path.absolute()}")
 
 plt.close(fig)
@@ -3,7 +3,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 from scipy import stats
-import statsmodels.api as sm
+
+from common import PNG_KWARGS
 
 rng = np.random.default_rng(7)
 
@@ -127,18 +128,18 @@ for label in ["Ultrabook", "Gaming"]:
     # Fit linear regression
     m, b = np.polyfit(x, y, 1)
     
-    # Calculate confidence intervals using statsmodels
-    X = sm.add_constant(x)
-    model = sm.OLS(y, X).fit()
-    
-    # Trend line only covers the data range for this group
-    xx = np.linspace(x.min(), x.max(), 200)
-    X_pred = sm.add_constant(xx)
-    pred = model.get_prediction(X_pred)
-    pred_frame = pred.summary_frame(alpha=0.05)
+    # 95% CI of the fitted mean (same band as OLS get_prediction mean_ci)
+    xx = np.linspace(x.min(), x.max(), 200)  # trend line only covers this group's range
+    n_obs = len(x)
+    resid = y - (m * x + b)
+    s2 = (resid @ resid) / (n_obs - 2)
+    xbar = x.mean()
+    sxx = ((x - xbar) ** 2).sum()
+    se_fit = np.sqrt(s2 * (1 / n_obs + (xx - xbar) ** 2 / sxx))
+    half = stats.t.ppf(0.975, n_obs - 2) * se_fit
     
     # Plot confidence interval
-    ax3.fill_between(xx, pred_frame['mean_ci_lower'], pred_frame['mean_ci_upper'], 
+    ax3.fill_between(xx, m * xx + b - half, m * xx + b + half, 
                    alpha=0.2, color=color_map[label])
     
     # Plot trend line
@@ -160,7 +161,7 @@ fig.suptitle(
 # Save the figure
 output_path = Path("../images/figure_7.png")
 output_path.parent.mkdir(parents=True, exist_ok=True)
-fig.savefig(output_path, facecolor="white", dpi=220)
+fig.savefig(output_path, facecolor="white", dpi=220, **PNG_KWARGS)
 print(f"Figure 7 saved to {output_path.absolute()}")
 
 plt.close(fig)
@@ -3,6 +3,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from common import PNG_KWARGS
+
 rng = np.random.default_rng(7)
 
 # Color palette
@@ -133,7 +135,7 @@ ax2.add_artist(legend1)
 # Save the figure
 output_path = Path("../images/figure_8.png")
 output_path.parent.mkdir(parents=True, exist_ok=True)
-fig.savefig(output_path, facecolor="white", dpi=220)
+fig.savefig(output_path, facecolor="white", dpi=220, **PNG_KWARGS)
 print(f"Figure 8 saved to {output_path.absolute()}")
 
 plt.close(fig)
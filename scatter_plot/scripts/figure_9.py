@@ -3,6 +3,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from common import PNG_KWARGS
+
 rng = np.random.default_rng(31415)
 
 # Color palette
@@ -21,14 +23,20 @@ n_rep = np.array([10, 12, 12, 10])
 
 true_resp = 1.8 + 0.55*levels + 0.35*np.log1p(levels)
 
-rows = []
-for lvl, nr, tr in zip(levels, n_rep, true_resp):
-    x_rep = rng.normal(lvl, 0.10*lvl, size=nr)                # prep variation (x)
-    y_rep = rng.normal(tr, 0.35 + 0.08*tr, size=nr)           # measurement noise (y)
-    for xr, yr in zip(x_rep, y_rep):
-        rows.append({"level_true": lvl, "level_prepared": xr, "response": yr})
-
-cal_raw = pd.DataFrame(rows)
+# One standard-normal block laid out as the per-level draws were: for each
+# level, nr prep values (x) then nr responses (y)
+lvl_rep = np.repeat(levels, n_rep)
+tr_rep = np.repeat(true_resp, n_rep)
+nr_rep = np.repeat(n_rep, n_rep)
+within = np.arange(n_rep.sum()) - np.repeat(np.cumsum(n_rep) - n_rep, n_rep)
+x_pos = np.repeat(2*np.cumsum(n_rep) - 2*n_rep, n_rep) + within
+z = rng.standard_normal(2*n_rep.sum())
+
+cal_raw = pd.DataFrame({
+    "level_true": lvl_rep,
+    "level_prepared": lvl_rep + 0.10*lvl_rep * z[x_pos],                # prep variation (x)
+    "response": tr_rep + (0.35 + 0.08*tr_rep) * z[x_pos + nr_rep],      # measurement noise (y)
+})
 
 summ = (cal_raw.groupby("level_true", as_index=False)
               .agg(n=("response","size"),
@@ -56,17 +64,21 @@ subjects_per_group = 18
 times = np.array([0, 2, 4, 8, 12, 16], dtype=float)
 
 def simulate_group(group_name, growth_scale, curvature, noise_base):
+    # Per subject: shift, scale, then one response per time point (same draw order)
+    z = rng.standard_normal((subjects_per_group, 2 + len(times)))
+    subj_shift = 8.0 * z[:, :1]
+    subj_scale = 1.0 + 0.08 * z[:, 1:2]
+    mu = (growth_scale * (times**curvature)) * subj_scale + subj_shift
+    mu_pos = np.maximum(mu, 0)
+    sd = noise_base + 0.12*mu_pos
+    y = mu_pos + sd * z[:, 2:]
     subj_ids = [f"{group_name}_{i:02d}" for i in range(1, subjects_per_group+1)]
-    data = []
-    for sid in subj_ids:
-        subj_shift = rng.normal(0, 8.0)
-        subj_scale = rng.normal(1.0, 0.08)
-        for t in times:
-            mu = (growth_scale * (t**curvature)) * subj_scale + subj_shift
-            sd = noise_base + 0.12*max(mu, 0)
-            y = rng.normal(max(mu, 0), sd)
-            data.append({"subject_id": sid, "group": group_name, "time": t, "response": max(y, 0)})
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        "subject_id": np.repeat(subj_ids, len(times)),
+        "group": group_name,
+        "time": np.tile(times, subjects_per_group),
+        "response": np.maximum(y, 0).ravel(),
+    })
 
 tc_low = simulate_group("Low",  growth_scale=3.8, curvature=1.25, noise_base=6.0)
 tc_high = simulate_group("High", growth_scale=6.0, curvature=1.35, noise_base=6.5)
@@ -131,7 +143,7 @@ ax2.legend(frameon=True, fontsize=8, title="Dose", title_fontsize=8, loc="upper
 # Save combined figure
 output_path = Path("../images/figure_9.png")
 output_path.parent.mkdir(parents=True, exist_ok=True)
-fig.savefig(output_path, facecolor="white", dpi=220)
+fig.savefig(output_path, facecolor="white", dpi=220, **PNG_KWARGS)
 print(f"Figure 9 saved to {output_path.absolute()}")
 
 plt.close(fig)
@@ -4,9 +4,10 @@ import matplotlib.pyplot as plt
 from pathlib import Path
 from matplotlib.colors import LinearSegmentedColormap
 
-# Set font to Inter
-plt.rcParams['font.family'] = 'Inter'
-plt.rcParams['font.sans-serif'] = ['Inter', 'sans-serif']
+from common import PNG_KWARGS, setup_style
+
+# Set font to Inter (first installed fallback otherwise)
+setup_style()
 
 # Color palette
 COLORS = ["#1B435E", "#FF7D2D", "#FAC846", "#A0C382", "#5F9B8C"]  # Dark Blue, Crusta, Bright Sun, Olivine, Patina
@@ -137,6 +138,6 @@ plt.tight_layout()
 plt.show()
 
 # Save the plot
-plt.savefig("figure_1_bubble_scatter.png", dpi=220, facecolor="white")
+plt.savefig("figure_1_bubble_scatter.png", dpi=220, facecolor="white", **PNG_KWARGS)
 plt.close()
 print("Saved: figure_1_bubble_scatter.png")
\ No newline at end of file